@@ -0,0 +1,45 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from airport_data import airline_totals, flight_cube, generate_airport_data
+
+# Below this many airports to summarize, the summaries run in-process. One takes about 10 ms from the route
+# cache (2 ms synthetic), while spawning the worker pool costs up to 3 s, which the parallel work only
+# repays from a few hundred airports on.
+PARALLEL_MIN_AIRPORTS = 400
+
+
+# Headline KPIs of one airport: routes, flights, domestic share, top airlines and peak departure hour.
+# Runs in a worker process, so it loads the data itself instead of going through the Streamlit caches.
+def airport_summary(airport_code, route_version):
+    if route_version is None:
+        _, destinations, flights = generate_airport_data(airport_code)
+    else:
+        from route_store import load_route_airport_data
+        _, destinations, flights = load_route_airport_data(airport_code)
+
+    cube = flight_cube(destinations, flights)
+    per_destination = cube["counts"].sum(axis=(1, 2))
+    per_hour = cube["counts"].sum(axis=(0, 1))
+    return {
+        "Airport": airport_code,
+        "Routes": int((per_destination > 0).sum()),
+        "Flights": int(per_destination.sum()),
+        "Domestic Share (%)": round(100 * per_destination[cube["domestic"]].sum() / per_destination.sum(), 1),
+        "Top Airlines": ", ".join(airline_totals(cube).head(3).index),
+        "Peak Hour": int(per_hour.argmax())
+    }
+
+
+# Worker pool for airport summaries. Workers are spawned rather than forked because the
+# Streamlit server process runs many threads.
+def make_summary_pool(max_workers=None):
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+# Summaries of several airports, returned in input order: computed concurrently in pool, or in-process
+# when pool is None
+def summarize_airports(pool, airport_codes, route_version):
+    map_function = map if pool is None else pool.map
+    return list(map_function(airport_summary, airport_codes, repeat(route_version)))
@@ -0,0 +1,192 @@
+import functools
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from airport_geo import distance_matrix
+
+# Major airports around the world with their coordinates
+DESTINATIONS = {
+    # Domestic destinations
+    "LAX": {"name": "Los Angeles International", "lat": 33.9416, "lon": -118.4085, "domestic": True, "region": "West"},
+    "ORD": {"name": "Chicago O'Hare International", "lat": 41.9786, "lon": -87.9048, "domestic": True, "region": "Midwest"},
+    "DFW": {"name": "Dallas/Fort Worth International", "lat": 32.8968, "lon": -97.0380, "domestic": True, "region": "South"},
+    "DEN": {"name": "Denver International", "lat": 39.8561, "lon": -104.6737, "domestic": True, "region": "West"},
+    "SFO": {"name": "San Francisco International", "lat": 37.6213, "lon": -122.3790, "domestic": True, "region": "West"},
+    "SEA": {"name": "Seattle-Tacoma International", "lat": 47.4502, "lon": -122.3088, "domestic": True, "region": "West"},
+    "MCO": {"name": "Orlando International", "lat": 28.4312, "lon": -81.3081, "domestic": True, "region": "South"},
+    # International destinations
+    "LHR": {"name": "London Heathrow", "lat": 51.4700, "lon": -0.4543, "domestic": False, "region": "Europe"},
+    "CDG": {"name": "Paris Charles de Gaulle", "lat": 49.0097, "lon": 2.5479, "domestic": False, "region": "Europe"},
+    "FRA": {"name": "Frankfurt Airport", "lat": 50.0379, "lon": 8.5622, "domestic": False, "region": "Europe"},
+    "NRT": {"name": "Tokyo Narita International", "lat": 35.7647, "lon": 140.3864, "domestic": False, "region": "Asia"},
+    "HKG": {"name": "Hong Kong International", "lat": 22.3080, "lon": 113.9185, "domestic": False, "region": "Asia"},
+    "SYD": {"name": "Sydney Airport", "lat": -33.9399, "lon": 151.1753, "domestic": False, "region": "Oceania"},
+    "GRU": {"name": "São Paulo/Guarulhos International", "lat": -23.4356, "lon": -46.4731, "domestic": False, "region": "South America"},
+}
+
+# Source airport coordinates
+AIRPORT_COORDINATES = {
+    "JFK": {"lat": 40.6413, "lon": -73.7781},
+    "ATL": {"lat": 33.6407, "lon": -84.4277},
+    "MIA": {"lat": 25.7932, "lon": -80.2906},
+    "BOS": {"lat": 42.3656, "lon": -71.0096},
+    "PHL": {"lat": 39.8729, "lon": -75.2437}
+}
+
+# Airlines that operate in the US; the first five are the domestic carriers
+AIRLINES = [
+    "American Airlines", "Delta Air Lines", "United Airlines",
+    "Southwest Airlines", "JetBlue Airways", "British Airways",
+    "Lufthansa", "Air France", "Emirates"
+]
+DOMESTIC_AIRLINE_COUNT = 5
+
+
+# Great-circle distances (nautical miles) from every source airport to every destination,
+# computed in one pass and shared by all airport loads in the process
+@functools.lru_cache(maxsize=None)
+def synthetic_distance_matrix():
+    matrix = distance_matrix(
+        [coordinates["lat"] for coordinates in AIRPORT_COORDINATES.values()],
+        [coordinates["lon"] for coordinates in AIRPORT_COORDINATES.values()],
+        [info["lat"] for info in DESTINATIONS.values()],
+        [info["lon"] for info in DESTINATIONS.values()]
+    )
+    matrix.flags.writeable = False
+    return matrix
+
+
+# Seeded generator so every airport always produces the same flights, in any process
+def airport_rng(airport_code):
+    return np.random.default_rng(zlib.crc32(airport_code.encode("utf-8")))
+
+
+# Number of flights per destination (in DESTINATIONS order) and the distance in nautical miles.
+# With n_flights the counts are rescaled to that total while keeping the same route mix.
+def destination_flight_counts(airport_code, rng, n_flights=None):
+    distance = synthetic_distance_matrix()[list(AIRPORT_COORDINATES).index(airport_code)]
+    domestic = np.array([info["domestic"] for info in DESTINATIONS.values()])
+
+    # Number of flights varies by destination, with more flights to domestic destinations
+    counts = rng.integers(5, 20, size=len(DESTINATIONS)) * np.where(domestic, 2, 1)
+
+    # Adjust for distance (fewer flights to farther destinations); 60 nautical miles to the degree
+    counts = np.maximum(1, (counts * (1 / (0.01 * distance / 60 + 0.5))).astype(np.int64))
+
+    if n_flights is not None:
+        counts = rng.multinomial(n_flights, counts / counts.sum())
+    return counts, distance
+
+
+# Generate synthetic flights departing from one of the East Coast airports.
+# Returns the source airport location, a small destinations dimension table (indexed by dest_id)
+# and a compact fact table with one row per flight: dest_id, airline as a category and the
+# departure hour as uint8.
+# All flights are drawn in a few batched NumPy calls rather than one Python iteration per flight.
+def generate_airport_data(airport_code, n_flights=None):
+    rng = airport_rng(airport_code)
+    counts, distance = destination_flight_counts(airport_code, rng, n_flights)
+
+    dest_info = list(DESTINATIONS.values())
+    destinations = pd.DataFrame({
+        "destination_airport": list(DESTINATIONS),
+        "destination_name": [info["name"] for info in dest_info],
+        "destination_lat": [info["lat"] for info in dest_info],
+        "destination_lon": [info["lon"] for info in dest_info],
+        "domestic": [info["domestic"] for info in dest_info],
+        "region": [info["region"] for info in dest_info],
+        "distance": distance  # Great-circle nautical miles
+    })
+    destinations.index.name = "dest_id"
+
+    # One destination id per flight
+    dest_id = np.repeat(np.arange(len(destinations), dtype=np.int16), counts)
+
+    # Domestic routes draw from the domestic carriers only, international routes from all airlines
+    domestic = destinations["domestic"].to_numpy()[dest_id]
+    airline_idx = rng.integers(0, np.where(domestic, DOMESTIC_AIRLINE_COUNT, len(AIRLINES)))
+
+    flights = pd.DataFrame({
+        "dest_id": dest_id,
+        "airline": pd.Categorical.from_codes(airline_idx.astype(np.int8), categories=AIRLINES),
+        "flight_hour": rng.integers(0, 24, size=len(dest_id), dtype=np.uint8)
+    })
+    source = {"code": airport_code, **AIRPORT_COORDINATES[airport_code]}
+    return source, destinations, flights
+
+
+# Origin and destination of every synthetic route between the East Coast airports and their destinations
+def synthetic_route_edges():
+    sources, destinations = [], []
+    for airport_code in AIRPORT_COORDINATES:
+        counts, _ = destination_flight_counts(airport_code, airport_rng(airport_code))
+        served = np.array(list(DESTINATIONS), dtype=object)[counts > 0]
+        sources.append(np.full(len(served), airport_code, dtype=object))
+        destinations.append(served)
+    return np.concatenate(sources), np.concatenate(destinations)
+
+
+# Codes and coordinates of every airport in the synthetic data, sources and destinations alike
+def synthetic_airport_locations():
+    locations = {**AIRPORT_COORDINATES, **DESTINATIONS}
+    return (
+        list(locations),
+        [info["lat"] for info in locations.values()],
+        [info["lon"] for info in locations.values()]
+    )
+
+
+# Labels of the four six-hour time-of-day buckets
+TIME_OF_DAY_LABELS = ['Night (0-6)', 'Morning (6-12)', 'Afternoon (12-18)', 'Evening (18-24)']
+
+
+# Flight counts per destination x airline x departure hour, built with one np.bincount over the fact table.
+# Problem 1 charts are answered from this cube, so their cost no longer depends on the number of flights.
+def flight_cube(destinations, flights):
+    airlines = flights["airline"].cat.categories
+    shape = (len(destinations), len(airlines), 24)
+    cell = np.ravel_multi_index(
+        (flights["dest_id"].to_numpy(), flights["airline"].cat.codes.to_numpy(), flights["flight_hour"].to_numpy()),
+        shape
+    )
+    counts = np.bincount(cell, minlength=np.prod(shape)).reshape(shape)
+    return {
+        "counts": counts,
+        "airlines": list(airlines),
+        "domestic": destinations["domestic"].to_numpy()
+    }
+
+
+# Flights per airline, busiest first
+def airline_totals(cube):
+    totals = pd.Series(cube["counts"].sum(axis=(0, 2)), index=cube["airlines"])
+    return totals[totals > 0].sort_values(ascending=False, kind="stable")
+
+
+# Flights per time-of-day bucket; hour // 6 puts hours 0-5 in the first bucket
+def time_of_day_totals(cube):
+    hour_totals = cube["counts"].sum(axis=(0, 1))
+    return pd.Series(hour_totals.reshape(4, 6).sum(axis=1), index=TIME_OF_DAY_LABELS)
+
+
+# Flights per airline split into domestic and international, one row per airline
+def airline_domestic_totals(cube):
+    per_destination = cube["counts"].sum(axis=2)
+    domestic = per_destination[cube["domestic"]].sum(axis=0)
+    international = per_destination[~cube["domestic"]].sum(axis=0)
+    return pd.DataFrame({"Domestic": domestic, "International": international}, index=cube["airlines"])
+
+
+# Route summary of every served destination (flight count, domestic flag and coordinates), busiest first
+def route_layer(destinations, cube):
+    routes = destinations[[
+        "destination_airport", "destination_name", "destination_lat", "destination_lon", "domestic"
+    ]].assign(flights=cube["counts"].sum(axis=(1, 2)))
+    return routes[routes["flights"] > 0].sort_values("flights", ascending=False, kind="stable")
+
+
+# Level-of-detail thinning for the route map: keep only the busiest routes of a route layer
+def thin_route_layer(routes, max_routes):
+    return routes.head(max_routes)
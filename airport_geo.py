@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+# Mean Earth radius in nautical miles
+EARTH_RADIUS_NM = 3440.065
+
+
+# Great-circle (haversine) distance in nautical miles; broadcasts over arrays of coordinates in degrees
+def haversine_nm(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(value) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_NM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+# Distances from every source (rows) to every destination (columns), computed in one broadcast pass.
+# float32 keeps a few-thousand-airport matrix to tens of megabytes.
+def distance_matrix(source_lat, source_lon, dest_lat, dest_lon, dtype=np.float32):
+    source_lat = np.asarray(source_lat, dtype=dtype)[:, None]
+    source_lon = np.asarray(source_lon, dtype=dtype)[:, None]
+    dest_lat = np.asarray(dest_lat, dtype=dtype)[None, :]
+    dest_lon = np.asarray(dest_lon, dtype=dtype)[None, :]
+    return haversine_nm(source_lat, source_lon, dest_lat, dest_lon).astype(dtype, copy=False)
+
+
+# Ball tree over airport coordinates with the haversine metric, for radius and nearest-airport queries.
+# Points are stored in radians, so radii and distances are converted from and to nautical miles.
+def build_airport_index(codes, lat, lon):
+    from sklearn.neighbors import BallTree
+
+    points = np.radians(np.column_stack([lat, lon]).astype(np.float64))
+    return {"codes": pd.Index(codes), "points": points, "tree": BallTree(points, metric="haversine")}
+
+
+# Codes and distances (nautical miles) of the indexed airports within radius_nm of a point, nearest first
+def airports_within(index, lat, lon, radius_nm):
+    (ids,), (distances,) = index["tree"].query_radius(
+        np.radians([[lat, lon]]), r=radius_nm / EARTH_RADIUS_NM, return_distance=True, sort_results=True
+    )
+    return index["codes"][ids], distances * EARTH_RADIUS_NM
+
+
+# Nearest other indexed airport to each of the given airports and its distance in nautical miles.
+# Codes missing from the index are skipped, and with fewer than two indexed airports there is no alternate.
+def nearest_alternates(index, airport_codes):
+    airport_codes = np.asarray(airport_codes)
+    positions = index["codes"].get_indexer(airport_codes)
+    known = positions >= 0
+    airport_codes, positions = airport_codes[known], positions[known]
+    if len(index["codes"]) < 2 or len(positions) == 0:
+        return pd.DataFrame({"Airport": airport_codes[:0], "Nearest Alternate": airport_codes[:0],
+                             "Alternate Distance (nm)": np.array([], dtype=np.float64)})
+    distances, ids = index["tree"].query(index["points"][positions], k=2)
+
+    # The closest hit is normally the airport itself, unless another airport shares its coordinates
+    other = (ids[:, 0] == positions).astype(np.intp)
+    rows = np.arange(len(positions))
+    return pd.DataFrame({
+        "Airport": airport_codes,
+        "Nearest Alternate": index["codes"][ids[rows, other]],
+        "Alternate Distance (nm)": distances[rows, other] * EARTH_RADIUS_NM
+    })
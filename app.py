@@ -1,16 +1,12 @@
+import logging
+import threading
+import time
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
-import folium
-from streamlit_folium import folium_static
-import seaborn as sns
-from sklearn.linear_model import LinearRegression
-import io
-import base64
-from matplotlib.figure import Figure
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from page_registry import PAGES, load_page_modules
+
+logger = logging.getLogger(__name__)
 
 # Set page configuration
 st.set_page_config(
@@ -50,13 +46,385 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# East Coast airports offered in Problem 1 when no local route files are available
+AIRPORT_OPTIONS = [
+    "JFK - John F. Kennedy International (New York)",
+    "ATL - Hartsfield-Jackson Atlanta International",
+    "MIA - Miami International",
+    "BOS - Boston Logan International",
+    "PHL - Philadelphia International"
+]
+
+# Above this many routes the folium map gets too heavy for the browser
+FOLIUM_ROUTE_LIMIT = 300
+
+# Largest route radius in nautical miles: no airport is further away than half the Earth's circumference
+MAX_RADIUS_NM = 10800
+
+# Problem 3 images: seed of the scatter jitter, resolution of the rendered PNGs and size (inches) of each figure
+JITTER_SEED = 0
+FIGURE_DPI = 100
+FIGURE_SIZES = {
+    'poor': (10, 8),
+    'improved': (12, 8),
+    'comparison': (18, 8),
+    'region_differences': (10, 6)
+}
+
+# Data loaders live at module level so the prewarm thread can fill their caches.
+# Each one imports its data module lazily to keep the Home page cold start small.
+@st.cache_data
+def load_airport_options(route_version):
+    if route_version is None:
+        return AIRPORT_OPTIONS
+    from route_store import build_route_cache, route_airport_options
+    build_route_cache()
+    return route_airport_options()
+
+# Routes come from the local route files when present, otherwise from the synthetic generator
+@st.cache_data
+def load_airport_data(airport_code, route_version):
+    if route_version is None:
+        from airport_data import generate_airport_data
+        return generate_airport_data(airport_code)
+    from route_store import build_route_cache, load_route_airport_data
+    build_route_cache()
+    return load_route_airport_data(airport_code)
+
+# Last read of the university data file, shared by all sessions so appended rows can be parsed on their own
+@st.cache_resource
+def load_university_reads():
+    return {}
+
+# University data for one file fingerprint (size, mtime and content hash), so edits show up without a restart.
+# It is sorted and indexed by (Year, Term) and shared read-only: filters slice it, so reruns never copy the table.
+# A file that cannot be parsed (e.g. while it is being written) keeps the last good read, or the sample data.
+@st.cache_resource(max_entries=2)
+def load_university_snapshot(fingerprint):
+    from university_data import index_university_data, read_university_data, sample_university_data, update_university_data
+    if fingerprint is None:
+        return {**index_university_data(read_university_data()), "version": "sample"}
+    reads = load_university_reads()
+    try:
+        reads["university"] = update_university_data(reads.get("university"), fingerprint=fingerprint)
+    except (OSError, ValueError):
+        if "university" not in reads:
+            return {**index_university_data(sample_university_data()), "version": "sample"}
+    # Versioned by the content hash of the data actually read, which is the previous read after a failure
+    return {**index_university_data(reads["university"]["data"]), "version": reads["university"]["sha256"]}
+
+# Per-term table aggregated from the student-level records by a query backend, indexed like the CSV snapshot
+@st.cache_resource(max_entries=2)
+def load_student_summary(fingerprint, backend):
+    from student_store import BACKENDS
+    from university_data import index_university_data
+    return {**index_university_data(BACKENDS[backend]()), "version": (fingerprint, backend)}
+
+# Next-year forecasts of every university series, computed once per dataset version
+@st.cache_resource(max_entries=4)
+def load_university_forecast(version, _data):
+    from forecast import forecast_next_terms
+    return forecast_next_terms(_data)
+
+# Cohort retention triangle of the enrollment records, computed once per file fingerprint
+@st.cache_data(max_entries=2)
+def load_cohort_retention(fingerprint):
+    import pandas as pd
+    from student_store import ENROLLMENT_COLUMNS, ENROLLMENT_RECORDS_PATH, cohort_retention
+    return cohort_retention(pd.read_parquet(ENROLLMENT_RECORDS_PATH, columns=ENROLLMENT_COLUMNS))
+
+# Monte Carlo draws of the next-year admissions funnel, drawn once per dataset version
+@st.cache_resource(max_entries=2)
+def load_funnel_scenarios(version, _data):
+    from funnel import draw_funnel_scenarios
+    return draw_funnel_scenarios(_data)
+
+# Funnel summary of one slider setting, memoized per dataset version so filter changes that leave the
+# funnel sliders alone don't re-run the simulation
+@st.cache_data(max_entries=64)
+def load_funnel_summary(version, admit_rate, capacity_factor, _scenarios):
+    from funnel import funnel_summary
+    return funnel_summary(_scenarios, admit_rate, capacity_factor)
+
+# Rendered Problem 3 images, in memory and on disk
+@st.cache_resource
+def load_image_cache():
+    from figure_cache import IMAGE_CACHE_DIR, ImageCache
+    return ImageCache(directory=IMAGE_CACHE_DIR)
+
+# Built Problem 2 figures, shared by all sessions and evicted least recently used first
+@st.cache_resource
+def load_figure_cache():
+    from figure_cache import FigureCache
+    return FigureCache()
+
+# Student-level records take precedence over the per-term CSV when they are available
+def load_university_data(backend="pandas"):
+    from student_store import STUDENT_RECORDS_PATH
+    from university_data import university_data_fingerprint
+    records_fingerprint = university_data_fingerprint(STUDENT_RECORDS_PATH)
+    if records_fingerprint is not None:
+        return load_student_summary(records_fingerprint, backend)
+    return load_university_snapshot(university_data_fingerprint())
+
+@st.cache_data
+def load_happiness_data():
+    from happiness_data import read_happiness_data
+    return read_happiness_data()
+
+# Source airport location on its own, so pages don't deserialize the flight table on every rerun
+@st.cache_data
+def load_airport_source(airport_code, route_version):
+    source, _, _ = load_airport_data(airport_code, route_version)
+    return source
+
+# Destination x airline x hour flight counts, computed once per airport; every Problem 1 chart reads it
+@st.cache_data
+def load_flight_cube(airport_code, route_version):
+    from airport_data import flight_cube
+    _, destinations, flights = load_airport_data(airport_code, route_version)
+    return flight_cube(destinations, flights)
+
+# Flight count, domestic flag and coordinates of every served destination, computed once per airport
+@st.cache_data
+def load_route_layer(airport_code, route_version):
+    from airport_data import route_layer
+    _, destinations, _ = load_airport_data(airport_code, route_version)
+    return route_layer(destinations, load_flight_cube(airport_code, route_version))
+
+# Network-wide route graph, built once per data version and shared read-only across sessions
+@st.cache_resource
+def load_route_graph(route_version):
+    from route_graph import build_route_graph
+    if route_version is None:
+        from airport_data import synthetic_route_edges
+        # Synthetic data only has departures from the East Coast airports, so return legs are assumed
+        return build_route_graph(*synthetic_route_edges(), symmetric=True)
+    from route_store import build_route_cache, read_route_edges
+    build_route_cache()
+    return build_route_graph(*read_route_edges())
+
+# Reachability counts and connecting hubs of one airport, cached per airport and data version
+@st.cache_data
+def load_hub_analysis(airport_code, route_version):
+    from route_graph import connecting_hubs, reachability_levels
+    graph = load_route_graph(route_version)
+    levels = reachability_levels(graph, airport_code)
+    return {
+        "direct": int((levels == 1).sum()),
+        "one_stop": int((levels == 2).sum()),
+        "two_stop": int((levels == 3).sum()),
+        "hubs": connecting_hubs(graph, levels)
+    }
+
+# Delay aggregates of one on-time file, cached per file fingerprint so adding a month only parses that month
+@st.cache_data
+def load_ontime_file_summary(path, file_version):
+    from ontime import summarize_ontime_file
+    return summarize_ontime_file(path)
+
+# Delay aggregates over every local on-time file; ontime_version lists each file's fingerprint.
+# A file that cannot be read is left out and reported in "skipped" with its error, instead of failing the section.
+@st.cache_data
+def load_ontime_summary(ontime_version):
+    from ontime import combine_ontime_summaries
+    summaries, skipped = [], []
+    for path, file_version in ontime_version:
+        try:
+            summaries.append(load_ontime_file_summary(path, file_version))
+        except Exception as error:
+            logger.exception("Reading on-time file %s failed", path)
+            skipped.append((path, str(error)))
+    return {"summary": combine_ontime_summaries(summaries), "skipped": skipped}
+
+# Live departure feed of one airport; sessions watching the same airport and settings share its counters
+@st.cache_resource(max_entries=8)
+def load_live_feed(airport_code, route_version, events_per_second, window_seconds):
+    from live_feed import LiveFeed
+    _, destinations, flights = load_airport_data(airport_code, route_version)
+    return LiveFeed(destinations, flights, events_per_second, window_seconds)
+
+# Spatial index over every airport in the data (not only the served ones), shared read-only across sessions
+@st.cache_resource
+def load_airport_index(route_version):
+    from airport_geo import build_airport_index
+    if route_version is None:
+        from airport_data import synthetic_airport_locations
+        return build_airport_index(*synthetic_airport_locations())
+    from route_store import build_route_cache, read_airport_locations
+    build_route_cache()
+    return build_airport_index(*read_airport_locations())
+
+# Route layer of an airport limited to destinations within radius_nm of it (all routes when radius_nm is None).
+# The radius query runs on the airport index, so it is cheap enough for every slider change.
+def load_routes_within(airport_code, route_version, radius_nm):
+    routes = load_route_layer(airport_code, route_version)
+    if radius_nm is None:
+        return routes
+    from airport_geo import airports_within
+    source = load_airport_source(airport_code, route_version)
+    nearby, _ = airports_within(load_airport_index(route_version), source["lat"], source["lon"], radius_nm)
+    return routes[routes["destination_airport"].isin(nearby)]
+
+@st.cache_data
+def load_network_hubs(route_version):
+    from route_graph import hub_ranking
+    return hub_ranking(load_route_graph(route_version))
+
+# Worker processes for the airport comparison, started on first use and shared by all sessions
+@st.cache_resource
+def load_summary_pool():
+    from airport_compare import make_summary_pool
+    return make_summary_pool()
+
+# Airport KPI summaries keyed by (airport code, data version), shared by all sessions
+@st.cache_resource
+def load_summary_cache():
+    return {}
+
+# KPI summaries of several airports; the ones not cached yet are computed in-process, or concurrently in the
+# worker pool when there are enough of them to pay for starting it
+def load_airport_summaries(airport_codes, route_version):
+    from airport_compare import PARALLEL_MIN_AIRPORTS, summarize_airports
+    summaries = load_summary_cache()
+    missing = [code for code in airport_codes if (code, route_version) not in summaries]
+    if missing:
+        if route_version is not None:
+            # Build the route cache here so the workers only read it
+            from route_store import build_route_cache
+            build_route_cache()
+        pool = load_summary_pool() if len(missing) >= PARALLEL_MIN_AIRPORTS else None
+        for code, summary in zip(missing, summarize_airports(pool, missing, route_version)):
+            summaries[(code, route_version)] = summary
+    return [summaries[(code, route_version)] for code in airport_codes]
+
+# Route map markup, memoized by airport, data version and radius so a rerun serves the cached HTML
+@st.cache_data
+def render_route_map(airport_code, route_version, radius_nm=None):
+    import folium
+
+    source = load_airport_source(airport_code, route_version)
+    routes = load_routes_within(airport_code, route_version, radius_nm)
+
+    # Get source coordinates
+    source_lat = source["lat"]
+    source_lon = source["lon"]
+
+    # Create interactive map
+    flight_map = folium.Map(location=[source_lat, source_lon], zoom_start=3)
+
+    # Add the source airport marker
+    folium.Marker(
+        location=[source_lat, source_lon],
+        popup=f"{airport_code}",
+        icon=folium.Icon(color="red", icon="plane", prefix="fa"),
+    ).add_to(flight_map)
+
+    # Add destination markers and flight paths
+    for route in routes.itertuples():
+        color = "blue" if route.domestic else "green"
+
+        # Destination marker
+        folium.Marker(
+            location=[route.destination_lat, route.destination_lon],
+            popup=f"{route.destination_airport} - {route.destination_name}",
+            icon=folium.Icon(color=color, icon="plane", prefix="fa"),
+        ).add_to(flight_map)
+
+        # Flight path, weighted by the number of flights on the route
+        folium.PolyLine(
+            locations=[[source_lat, source_lon], [route.destination_lat, route.destination_lon]],
+            color=color,
+            weight=1 + route.flights / 10,
+            opacity=0.7
+        ).add_to(flight_map)
+
+    return folium.Figure().add_child(flight_map).render()
+
+# GPU-rendered route map: all routes go into one batched arc layer, so the browser stays responsive
+# with thousands of routes where folium would emit one marker and one polyline each.
+# Arcs are colored by domestic flag at the destination end and widened by flight count.
+def build_route_deck(source, routes):
+    import pydeck as pdk
+
+    # Ship only the columns the layer reads; colors and widths are computed on the GPU from them
+    arcs = routes[["destination_airport", "destination_lat", "destination_lon", "domestic", "flights"]].round(3)
+    return pdk.Deck(
+        layers=[
+            pdk.Layer(
+                "ArcLayer",
+                data=arcs,
+                get_source_position=[source["lon"], source["lat"]],
+                get_target_position=["destination_lon", "destination_lat"],
+                get_source_color=[216, 27, 96],
+                get_target_color="domestic ? [30, 136, 229] : [46, 125, 50]",
+                get_width="1 + flights / 10",
+                pickable=True
+            )
+        ],
+        initial_view_state=pdk.ViewState(latitude=source["lat"], longitude=source["lon"], zoom=1.5, pitch=30),
+        tooltip={"text": "{destination_airport}\nFlights: {flights}"}
+    )
+
+# Section selector standing in for st.tabs, which runs the body of every tab on each rerun.
+# Pages branch on the returned label so only the visible section is computed.
+def lazy_tabs(labels, key):
+    return st.radio("Section:", labels, horizontal=True, key=key, label_visibility="collapsed")
+
+# Fill every loader cache in a background thread, once per server process.
+# Airports are prewarmed for the East Coast options (and the route cache is built when route files exist);
+# rendering their route maps also fills the airport data and route layer caches.
+@st.cache_resource
+def start_cache_prewarm():
+    status = {"done": False, "seconds": None, "timings": {}}
+
+    def prewarm():
+        from route_store import route_data_version
+        route_version = route_data_version()
+
+        start = time.perf_counter()
+        airport_codes = {option.split(" - ")[0] for option in load_airport_options(route_version)}
+        status["timings"]["Airport list"] = time.perf_counter() - start
+
+        jobs = [(f"Route map {option.split(' - ')[0]}", render_route_map, (option.split(" - ")[0], route_version))
+                for option in AIRPORT_OPTIONS if option.split(" - ")[0] in airport_codes]
+        jobs += [("University", load_university_data, ()), ("Happiness", load_happiness_data, ())]
+
+        for name, loader, args in jobs:
+            job_start = time.perf_counter()
+            try:
+                loader(*args)
+            except Exception:
+                logger.exception("Prewarming %s data failed", name)
+            status["timings"][name] = time.perf_counter() - job_start
+        status["seconds"] = time.perf_counter() - start
+        status["done"] = True
+        logger.info("Prewarmed %d data caches in %.2fs", len(jobs), status["seconds"])
+
+    # Share the triggering session's context so cache calls from the thread don't warn
+    thread = threading.Thread(target=prewarm, name="cache-prewarm", daemon=True)
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+    return status
+
+prewarm_status = start_cache_prewarm()
+
 # Create navigation sidebar
 st.sidebar.markdown("# Navigation")
 page = st.sidebar.radio(
     "Select Problem:",
-    ["Home", "Problem 1: Airport Analysis", "Problem 2: University Dashboard", "Problem 3: Data Visualization Comparison"]
+    list(PAGES)
 )
 
+# Heavy libraries are imported per page so opening one page never pays for the others
+load_page_modules(page)
+
+# Report cache prewarm progress
+if prewarm_status["done"]:
+    st.sidebar.caption(f"Data caches prewarmed in {prewarm_status['seconds']:.2f}s")
+else:
+    st.sidebar.caption("Prewarming data caches...")
+
 # Home Page
 if page == "Home":
     st.markdown('<div class="main-header">Visual Analytics and Communication</div>', unsafe_allow_html=True)
@@ -93,6 +461,14 @@ if page == "Home":
 
 # Problem 1: Airport Analysis
 elif page == "Problem 1: Airport Analysis":
+    import plotly.express as px
+    import plotly.graph_objects as go
+    import streamlit.components.v1 as components
+    from airport_data import airline_domestic_totals, airline_totals, thin_route_layer, time_of_day_totals
+    from airport_geo import nearest_alternates
+    from ontime import DELAY_BIN_LABELS, ONTIME_DIR, ontime_airports, ontime_breakdown, ontime_data_version, ontime_totals
+    from route_store import route_data_version
+
     st.markdown('<div class="main-header">Problem 1: Airport Analysis</div>', unsafe_allow_html=True)
     
     st.markdown("""
@@ -101,282 +477,428 @@ elif page == "Problem 1: Airport Analysis":
     domestic vs. international flight distributions, connecting hubs, and airline operations.
     """)
     
-    # Airport selection
+    # Airport selection, populated from the route cache index when local route files exist
+    route_version = route_data_version()
+    airport_options = load_airport_options(route_version)
     st.sidebar.markdown("## Airport Selection")
-    airport = st.sidebar.selectbox(
-        "Select an East Coast Airport:",
-        ["JFK - John F. Kennedy International (New York)",
-         "ATL - Hartsfield-Jackson Atlanta International",
-         "MIA - Miami International",
-         "BOS - Boston Logan International",
-         "PHL - Philadelphia International"],
-        index=0
+    analysis_mode = st.sidebar.radio(
+        "Analysis mode:",
+        ["Single airport", "Compare airports", "Live departures"]
     )
+
+    if analysis_mode == "Compare airports":
+        import pandas as pd
+
+        # Airports to compare; the first five options are the East Coast airports or the busiest in the route cache
+        compared = st.sidebar.multiselect(
+            "Select airports to compare:",
+            airport_options,
+            default=airport_options[:5]
+        )
+
+        st.markdown('<div class="sub-header">Airport Comparison</div>', unsafe_allow_html=True)
+        if not compared:
+            st.info("Select at least one airport to compare.")
+        else:
+            # Airports not summarized yet are computed in-process, or in the worker pool when there are many
+            compared_codes = tuple(option.split(" - ")[0] for option in compared)
+            start = time.perf_counter()
+            summaries = load_airport_summaries(compared_codes, route_version)
+            st.caption(f"Summarized {len(summaries)} airports in {time.perf_counter() - start:.2f}s.")
+
+            # Side-by-side KPIs, five airports per row
+            for row_start in range(0, len(summaries), 5):
+                for column, summary in zip(st.columns(5), summaries[row_start:row_start + 5]):
+                    with column:
+                        st.subheader(summary['Airport'])
+                        st.metric("Routes", f"{summary['Routes']:,}")
+                        st.metric("Domestic Share", f"{summary['Domestic Share (%)']}%")
+                        st.metric("Peak Hour", f"{summary['Peak Hour']:02d}:00")
+                        st.caption(f"Top airlines: {summary['Top Airlines']}")
+
+            comparison = pd.DataFrame(summaries)
+            st.dataframe(comparison, hide_index=True, use_container_width=True)
+
+            fig = px.bar(
+                comparison,
+                x='Airport',
+                y='Routes',
+                color='Domestic Share (%)',
+                color_continuous_scale='Blues',
+                text='Routes',
+                hover_data=['Flights', 'Top Airlines', 'Peak Hour'],
+                title='Direct Routes and Domestic Share by Airport'
+            )
+            st.plotly_chart(fig, use_container_width=True)
+    elif analysis_mode == "Live departures":
+        airport = st.sidebar.selectbox(
+            "Select an East Coast Airport:" if route_version is None else "Select an Airport:",
+            airport_options,
+            index=next((i for i, option in enumerate(airport_options) if option.startswith("JFK - ")), 0)
+        )
+        airport_code = airport.split(" - ")[0]
+
+        # Replay speed of the simulated feed and length of the rolling window
+        st.sidebar.markdown("## Live Feed")
+        events_per_second = st.sidebar.select_slider(
+            "Departures per second:",
+            options=[10, 100, 1000, 5000, 10000],
+            value=1000
+        )
+        window_seconds = st.sidebar.select_slider(
+            "Rolling window (seconds):",
+            options=[10, 30, 60, 300],
+            value=60
+        )
+        feed = load_live_feed(airport_code, route_version, events_per_second, window_seconds)
+
+        st.markdown('<div class="sub-header">Live Departures</div>', unsafe_allow_html=True)
+        st.write(f"A simulated feed replays the departures of {airport_code} as a stream of events. "
+                 "The charts refresh every two seconds from rolling-window counters that are updated as events arrive.")
+
+        # Only this block reruns on the refresh interval; the rest of the page stays as rendered
+        @st.fragment(run_every=2)
+        def live_departures():
+            snapshot = feed.snapshot()
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric(f"Departures in the Last {window_seconds}s", f"{snapshot['destinations'].sum():,}")
+            with col2:
+                st.metric("Events Ingested", f"{snapshot['events']:,}")
+
+            live_destinations = snapshot['destinations'].head(10).rename_axis('Destination').reset_index(name='Departures')
+            fig = px.bar(
+                live_destinations,
+                x='Departures',
+                y='Destination',
+                orientation='h',
+                color='Departures',
+                color_continuous_scale='Blues',
+                title='Busiest Destinations in the Window'
+            )
+            fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+            st.plotly_chart(fig, use_container_width=True)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                live_airlines = snapshot['airlines'].head(10).rename_axis('Airline').reset_index(name='Departures')
+                fig = px.bar(live_airlines, x='Airline', y='Departures', title='Departures by Airline')
+                st.plotly_chart(fig, use_container_width=True)
+            with col2:
+                live_hours = snapshot['hours'].rename_axis('Scheduled Hour').reset_index(name='Departures')
+                fig = px.bar(live_hours, x='Scheduled Hour', y='Departures', title='Departures by Scheduled Hour')
+                st.plotly_chart(fig, use_container_width=True)
+
+        live_departures()
+    else:
+        airport = st.sidebar.selectbox(
+            "Select an East Coast Airport:" if route_version is None else "Select an Airport:",
+            airport_options,
+            index=next((i for i, option in enumerate(airport_options) if option.startswith("JFK - ")), 0)
+        )
     
-    # Get airport code
-    airport_code = airport.split(" - ")[0]
+        # Get airport code
+        airport_code = airport.split(" - ")[0]
     
-    # Function to load airport data
-    @st.cache_data
-    def load_airport_data(airport_code):
-        # Create synthetic data for demonstration
-        np.random.seed(42)  # For reproducibility
-        
-        # Major airports around the world with their coordinates
-        destinations = {
-            # Domestic destinations
-            "LAX": {"name": "Los Angeles International", "lat": 33.9416, "lon": -118.4085, "domestic": True, "region": "West"},
-            "ORD": {"name": "Chicago O'Hare International", "lat": 41.9786, "lon": -87.9048, "domestic": True, "region": "Midwest"},
-            "DFW": {"name": "Dallas/Fort Worth International", "lat": 32.8968, "lon": -97.0380, "domestic": True, "region": "South"},
-            "DEN": {"name": "Denver International", "lat": 39.8561, "lon": -104.6737, "domestic": True, "region": "West"},
-            "SFO": {"name": "San Francisco International", "lat": 37.6213, "lon": -122.3790, "domestic": True, "region": "West"},
-            "SEA": {"name": "Seattle-Tacoma International", "lat": 47.4502, "lon": -122.3088, "domestic": True, "region": "West"},
-            "MCO": {"name": "Orlando International", "lat": 28.4312, "lon": -81.3081, "domestic": True, "region": "South"},
-            # International destinations
-            "LHR": {"name": "London Heathrow", "lat": 51.4700, "lon": -0.4543, "domestic": False, "region": "Europe"},
-            "CDG": {"name": "Paris Charles de Gaulle", "lat": 49.0097, "lon": 2.5479, "domestic": False, "region": "Europe"},
-            "FRA": {"name": "Frankfurt Airport", "lat": 50.0379, "lon": 8.5622, "domestic": False, "region": "Europe"},
-            "NRT": {"name": "Tokyo Narita International", "lat": 35.7647, "lon": 140.3864, "domestic": False, "region": "Asia"},
-            "HKG": {"name": "Hong Kong International", "lat": 22.3080, "lon": 113.9185, "domestic": False, "region": "Asia"},
-            "SYD": {"name": "Sydney Airport", "lat": -33.9399, "lon": 151.1753, "domestic": False, "region": "Oceania"},
-            "GRU": {"name": "São Paulo/Guarulhos International", "lat": -23.4356, "lon": -46.4731, "domestic": False, "region": "South America"},
-        }
-        
-        # Source airport coordinates
-        airport_coordinates = {
-            "JFK": {"lat": 40.6413, "lon": -73.7781},
-            "ATL": {"lat": 33.6407, "lon": -84.4277},
-            "MIA": {"lat": 25.7932, "lon": -80.2906},
-            "BOS": {"lat": 42.3656, "lon": -71.0096},
-            "PHL": {"lat": 39.8729, "lon": -75.2437}
-        }
-        
-        # Get source airport coordinates
-        source_lat = airport_coordinates[airport_code]["lat"]
-        source_lon = airport_coordinates[airport_code]["lon"]
-        
-        # Airlines that operate in the US
-        airlines = [
-            "American Airlines", "Delta Air Lines", "United Airlines", 
-            "Southwest Airlines", "JetBlue Airways", "British Airways", 
-            "Lufthansa", "Air France", "Emirates"
-        ]
-        
-        # Generate flight data
-        flights = []
-        
-        for dest_code, dest_info in destinations.items():
-            # Number of flights varies by destination
-            num_flights = np.random.randint(5, 20)
-            
-            # More flights to domestic destinations
-            if dest_info["domestic"]:
-                num_flights *= 2
-            
-            # Adjust for distance (fewer flights to farther destinations)
-            distance = np.sqrt((source_lat - dest_info["lat"])**2 + (source_lon - dest_info["lon"])**2)
-            num_flights = int(num_flights * (1 / (0.01 * distance + 0.5)))
-            num_flights = max(1, num_flights)
-            
-            for _ in range(num_flights):
-                # Randomly assign airlines (weighted for domestic/international)
-                if dest_info["domestic"]:
-                    airline_idx = np.random.randint(0, 5)  # Domestic airlines more likely
-                else:
-                    airline_idx = np.random.randint(0, len(airlines))
-                    
-                # Random flight time (more for international)
-                flight_hour = np.random.randint(0, 24)
-                
-                # Create flight entry
-                flight = {
-                    "source_airport": airport_code,
-                    "destination_airport": dest_code,
-                    "destination_name": dest_info["name"],
-                    "destination_lat": dest_info["lat"],
-                    "destination_lon": dest_info["lon"],
-                    "airline": airlines[airline_idx],
-                    "flight_hour": flight_hour,
-                    "domestic": dest_info["domestic"],
-                    "region": dest_info["region"],
-                    "distance": distance * 60  # Approximate nautical miles
-                }
-                flights.append(flight)
-        
-        return pd.DataFrame(flights)
+        # Load the source location and the per-airport aggregates; the flight table itself stays in the cache
+        source = load_airport_source(airport_code, route_version)
+        cube = load_flight_cube(airport_code, route_version)
+        if route_version is not None:
+            st.caption("Routes are read from the local OpenFlights route files. "
+                       "These files carry no schedules, so departure hours are simulated.")
 
-    # Load and prepare the airport data
-    airport_data = load_airport_data(airport_code)
+        # Per-destination route summary, shared by the charts that only need destination attributes
+        routes = load_route_layer(airport_code, route_version)
     
-    # Create tabs for different sections
-    tab1, tab2, tab3 = st.tabs([
-        "Route Map & Destinations", 
-        "Flight Distribution", 
-        "Airline Analysis"
-    ])
+        # Only the selected section runs, and switching sections reruns this fragment alone
+        @st.fragment
+        def problem1_sections():
+            section = lazy_tabs([
+                "Route Map & Destinations", 
+                "Flight Distribution", 
+                "Airline Analysis",
+                "Connecting Hubs",
+                "On-Time Performance"
+            ], key="problem1_sections")
     
-    with tab1:
-        st.markdown('<div class="sub-header">Direct Routes & Popular Destinations</div>', unsafe_allow_html=True)
-        
-        # Create a map centered on the source airport
-        airport_coordinates = {
-            "JFK": {"lat": 40.6413, "lon": -73.7781},
-            "ATL": {"lat": 33.6407, "lon": -84.4277},
-            "MIA": {"lat": 25.7932, "lon": -80.2906},
-            "BOS": {"lat": 42.3656, "lon": -71.0096},
-            "PHL": {"lat": 39.8729, "lon": -75.2437}
-        }
-        
-        # Get source coordinates
-        source_lat = airport_coordinates[airport_code]["lat"]
-        source_lon = airport_coordinates[airport_code]["lon"]
-        
-        # Create interactive map
-        flight_map = folium.Map(location=[source_lat, source_lon], zoom_start=3)
-        
-        # Add the source airport marker
-        folium.Marker(
-            location=[source_lat, source_lon],
-            popup=f"{airport_code}",
-            icon=folium.Icon(color="red", icon="plane", prefix="fa"),
-        ).add_to(flight_map)
-        
-        # Add destination markers and flight paths
-        for _, flight in airport_data.drop_duplicates(subset=['destination_airport']).iterrows():
-            # Destination marker
-            folium.Marker(
-                location=[flight['destination_lat'], flight['destination_lon']],
-                popup=f"{flight['destination_airport']} - {flight['destination_name']}",
-                icon=folium.Icon(color="blue" if flight['domestic'] else "green", icon="plane", prefix="fa"),
-            ).add_to(flight_map)
-            
-            # Flight path
-            folium.PolyLine(
-                locations=[[source_lat, source_lon], [flight['destination_lat'], flight['destination_lon']]],
-                color="blue" if flight['domestic'] else "green",
-                weight=1 + (airport_data['destination_airport'] == flight['destination_airport']).sum() / 10,
-                opacity=0.7
-            ).add_to(flight_map)
-        
-        # Display the map
-        st.write("The map shows all direct routes from the selected airport. Domestic routes are shown in blue, and international routes are shown in green.")
-        folium_static(flight_map)
-        
-        # Top 5 destinations by number of flights
-        st.subheader("Top 5 Destinations")
-        top_destinations = airport_data['destination_airport'].value_counts().reset_index()
-        top_destinations.columns = ['Destination', 'Number of Flights']
-        top_destinations = top_destinations.head(5)
-        
-        # Get full names for the destinations
-        top_destinations['Destination Name'] = top_destinations['Destination'].map(
-            airport_data.set_index('destination_airport')['destination_name'].drop_duplicates().to_dict()
-        )
+            if section == "Route Map & Destinations":
+                st.markdown('<div class="sub-header">Direct Routes & Popular Destinations</div>', unsafe_allow_html=True)
         
-        # Create a horizontal bar chart
-        fig = px.bar(
-            top_destinations,
-            y='Destination',
-            x='Number of Flights',
-            text='Number of Flights',
-            color='Number of Flights',
-            color_continuous_scale='Blues',
-            orientation='h',
-            title='Top 5 Destinations by Number of Flights',
-            hover_data=['Destination Name']
-        )
-        st.plotly_chart(fig, use_container_width=True)
+                st.write("The map shows all direct routes from the selected airport. Domestic routes are shown in blue, and international routes are shown in green.")
+
+                # Map controls live in this section, so changing them only reruns the section fragment.
+                # Folium draws one element per route, so large networks default to WebGL.
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    map_renderer = st.radio(
+                        "Map renderer:",
+                        ["Folium (detailed)", "WebGL (large networks)"],
+                        index=1 if len(routes) > FOLIUM_ROUTE_LIMIT else 0
+                    )
+                with col2:
+                    # The largest radius keeps every route
+                    radius_nm = st.slider(
+                        "Destinations within (nautical miles):",
+                        min_value=100,
+                        max_value=MAX_RADIUS_NM,
+                        value=MAX_RADIUS_NM,
+                        step=100
+                    )
+                    radius_nm = None if radius_nm >= MAX_RADIUS_NM else radius_nm
+                with col3:
+                    if map_renderer == "WebGL (large networks)":
+                        max_routes = st.select_slider(
+                            "Routes drawn (busiest first):",
+                            options=[100, 500, 1000, 5000, 10000, 50000],
+                            value=5000
+                        )
+                map_routes = load_routes_within(airport_code, route_version, radius_nm)
+
+                if radius_nm is not None:
+                    st.caption(f"{len(map_routes):,} of {len(routes):,} destinations lie within {radius_nm:,} nautical miles.")
+                if map_renderer == "WebGL (large networks)":
+                    # Draw the busiest routes as a single GPU layer
+                    drawn_routes = thin_route_layer(map_routes, max_routes)
+                    st.pydeck_chart(build_route_deck(source, drawn_routes))
+                    st.caption(f"Showing the {len(drawn_routes):,} busiest of {len(map_routes):,} routes.")
+                else:
+                    # Display the map from its memoized markup
+                    if len(map_routes) > FOLIUM_ROUTE_LIMIT:
+                        st.warning(f"{len(map_routes):,} routes may be slow to draw with folium; switch to the WebGL renderer for large networks.")
+                    components.html(render_route_map(airport_code, route_version, radius_nm), height=510, width=700)
+
+                # Closest other airport to each mapped destination, looked up in the airport index.
+                # The index needs sklearn, so it is only built once the table is asked for.
+                st.subheader("Nearest Alternate Airports")
+                show_alternates = st.toggle("Show nearest alternate airports", key="problem1_alternates")
+                if show_alternates and map_routes.empty:
+                    st.info("No destinations lie within the selected radius.")
+                elif show_alternates:
+                    alternates = nearest_alternates(load_airport_index(route_version), map_routes['destination_airport'])
+                    destinations = map_routes.set_index('destination_airport').loc[alternates['Airport']]
+                    alternates.insert(1, 'Destination Name', destinations['destination_name'].to_numpy())
+                    alternates.insert(2, 'Number of Flights', destinations['flights'].to_numpy())
+                    alternates['Alternate Distance (nm)'] = alternates['Alternate Distance (nm)'].round(0).astype(int)
+                    st.dataframe(alternates.rename(columns={'Airport': 'Destination'}), hide_index=True, use_container_width=True)
+        
+                # Top 5 destinations by number of flights
+                st.subheader("Top 5 Destinations")
+                top_destinations = routes.head(5)[['destination_airport', 'flights', 'destination_name']]
+                top_destinations.columns = ['Destination', 'Number of Flights', 'Destination Name']
+        
+                # Create a horizontal bar chart
+                fig = px.bar(
+                    top_destinations,
+                    y='Destination',
+                    x='Number of Flights',
+                    text='Number of Flights',
+                    color='Number of Flights',
+                    color_continuous_scale='Blues',
+                    orientation='h',
+                    title='Top 5 Destinations by Number of Flights',
+                    hover_data=['Destination Name']
+                )
+                st.plotly_chart(fig, use_container_width=True)
     
-    with tab2:
-        st.markdown('<div class="sub-header">Flight Distribution Analysis</div>', unsafe_allow_html=True)
-        
-        # Domestic vs International flights
-        st.subheader("Domestic vs. International Flights")
-        
-        domestic_count = airport_data['domestic'].value_counts()
-        domestic_pct = (domestic_count / domestic_count.sum() * 100).round(1)
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=['Domestic', 'International'],
-            y=[domestic_count.get(True, 0), domestic_count.get(False, 0)],
-            text=[f"{domestic_pct.get(True, 0)}%", f"{domestic_pct.get(False, 0)}%"],
-            textposition='auto',
-            marker_color=['#1f77b4', '#ff7f0e']
-        ))
-        fig.update_layout(
-            title='Domestic vs. International Flights',
-            xaxis_title='Flight Type',
-            yaxis_title='Number of Flights'
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Flight volume by time of day
-        st.subheader("Flight Volume by Time of Day")
-        airport_data['time_category'] = pd.cut(
-            airport_data['flight_hour'],
-            bins=[0, 6, 12, 18, 24],
-            labels=['Night (0-6)', 'Morning (6-12)', 'Afternoon (12-18)', 'Evening (18-24)']
-        )
+            elif section == "Flight Distribution":
+                st.markdown('<div class="sub-header">Flight Distribution Analysis</div>', unsafe_allow_html=True)
+        
+                # Domestic vs International flights
+                st.subheader("Domestic vs. International Flights")
+        
+                domestic_count = routes.groupby('domestic')['flights'].sum()
+                domestic_pct = (domestic_count / domestic_count.sum() * 100).round(1)
+        
+                fig = go.Figure()
+                fig.add_trace(go.Bar(
+                    x=['Domestic', 'International'],
+                    y=[domestic_count.get(True, 0), domestic_count.get(False, 0)],
+                    text=[f"{domestic_pct.get(True, 0)}%", f"{domestic_pct.get(False, 0)}%"],
+                    textposition='auto',
+                    marker_color=['#1f77b4', '#ff7f0e']
+                ))
+                fig.update_layout(
+                    title='Domestic vs. International Flights',
+                    xaxis_title='Flight Type',
+                    yaxis_title='Number of Flights'
+                )
+                st.plotly_chart(fig, use_container_width=True)
+        
+                # Flight volume by time of day
+                st.subheader("Flight Volume by Time of Day")
+                time_distribution = time_of_day_totals(cube).reset_index()
+                time_distribution.columns = ['Time of Day', 'Number of Flights']
+        
+                fig = px.pie(
+                    time_distribution,
+                    values='Number of Flights',
+                    names='Time of Day',
+                    title='Flight Distribution by Time of Day',
+                    color_discrete_sequence=px.colors.sequential.Blues_r
+                )
+                fig.update_traces(textposition='inside', textinfo='percent+label')
+                st.plotly_chart(fig, use_container_width=True)
+    
+            elif section == "Airline Analysis":
+                st.markdown('<div class="sub-header">Airline Operations</div>', unsafe_allow_html=True)
+        
+                # Most frequent airlines
+                st.subheader("Most Frequent Airlines")
+        
+                airline_counts = airline_totals(cube).head(5).reset_index()
+                airline_counts.columns = ['Airline', 'Number of Flights']
+        
+                fig = px.bar(
+                    airline_counts,
+                    x='Airline',
+                    y='Number of Flights',
+                    color='Number of Flights',
+                    color_continuous_scale='Blues',
+                    text='Number of Flights',
+                    title='Top 5 Airlines by Number of Flights'
+                )
+                fig.update_layout(
+                    xaxis_title='Airline',
+                    yaxis_title='Number of Flights',
+                    xaxis={'categoryorder': 'total descending'}
+                )
+                st.plotly_chart(fig, use_container_width=True)
         
-        time_distribution = airport_data['time_category'].value_counts().reset_index()
-        time_distribution.columns = ['Time of Day', 'Number of Flights']
+                # Airline distribution for domestic vs international
+                st.subheader("Airline Distribution: Domestic vs. International")
         
-        fig = px.pie(
-            time_distribution,
-            values='Number of Flights',
-            names='Time of Day',
-            title='Flight Distribution by Time of Day',
-            color_discrete_sequence=px.colors.sequential.Blues_r
-        )
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig, use_container_width=True)
+                airline_by_type = airline_domestic_totals(cube).rename_axis('Airline').reset_index().melt(
+                    id_vars='Airline', var_name='Flight Type', value_name='Count'
+                )
+        
+                # Get top 5 airlines overall
+                top_airlines = airline_counts['Airline'].tolist()
+                airline_by_type_filtered = airline_by_type[airline_by_type['Airline'].isin(top_airlines)]
+        
+                fig = px.bar(
+                    airline_by_type_filtered,
+                    x='Airline',
+                    y='Count',
+                    color='Flight Type',
+                    barmode='group',
+                    title='Top Airlines: Domestic vs. International Flights'
+                )
+                st.plotly_chart(fig, use_container_width=True)
     
-    with tab3:
-        st.markdown('<div class="sub-header">Airline Operations</div>', unsafe_allow_html=True)
-        
-        # Most frequent airlines
-        st.subheader("Most Frequent Airlines")
-        
-        airline_counts = airport_data['airline'].value_counts().reset_index().head(5)
-        airline_counts.columns = ['Airline', 'Number of Flights']
-        
-        fig = px.bar(
-            airline_counts,
-            x='Airline',
-            y='Number of Flights',
-            color='Number of Flights',
-            color_continuous_scale='Blues',
-            text='Number of Flights',
-            title='Top 5 Airlines by Number of Flights'
-        )
-        fig.update_layout(
-            xaxis_title='Airline',
-            yaxis_title='Number of Flights',
-            xaxis={'categoryorder': 'total descending'}
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Airline distribution for domestic vs international
-        st.subheader("Airline Distribution: Domestic vs. International")
-        
-        airline_by_type = airport_data.groupby(['airline', 'domestic']).size().reset_index()
-        airline_by_type.columns = ['Airline', 'Domestic', 'Count']
-        airline_by_type['Flight Type'] = airline_by_type['Domestic'].map({True: 'Domestic', False: 'International'})
-        
-        # Get top 5 airlines overall
-        top_airlines = airline_counts['Airline'].tolist()
-        airline_by_type_filtered = airline_by_type[airline_by_type['Airline'].isin(top_airlines)]
-        
-        fig = px.bar(
-            airline_by_type_filtered,
-            x='Airline',
-            y='Count',
-            color='Flight Type',
-            barmode='group',
-            title='Top Airlines: Domestic vs. International Flights'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            elif section == "Connecting Hubs":
+                st.markdown('<div class="sub-header">Connecting Hubs</div>', unsafe_allow_html=True)
+        
+                # Airports reachable from the selected airport by number of flights
+                hub_analysis = load_hub_analysis(airport_code, route_version)
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Direct Destinations", f"{hub_analysis['direct']:,}")
+                with col2:
+                    st.metric("One-stop Destinations", f"{hub_analysis['one_stop']:,}")
+                with col3:
+                    st.metric("Two-stop Destinations", f"{hub_analysis['two_stop']:,}")
+                if route_version is None:
+                    st.caption("The synthetic network only has departures from the East Coast airports, so return flights are assumed on every route.")
+        
+                # Direct destinations that open up the most one-stop destinations
+                st.subheader(f"Top Connecting Hubs from {airport_code}")
+                top_hubs = hub_analysis['hubs'].head(10)
+        
+                fig = px.bar(
+                    top_hubs,
+                    x='Hub',
+                    y='One-stop Destinations',
+                    color='One-stop Destinations',
+                    color_continuous_scale='Blues',
+                    text='One-stop Destinations',
+                    hover_data=['Hub Routes'],
+                    title=f'Hubs Connecting {airport_code} to the Most One-stop Destinations'
+                )
+                st.plotly_chart(fig, use_container_width=True)
+        
+                # Network-wide ranking of transfer airports
+                st.subheader("Busiest Transfer Airports in the Network")
+                network_hubs = load_network_hubs(route_version).head(10)
+        
+                fig = px.bar(
+                    network_hubs,
+                    x='Airport',
+                    y='Transfer Score',
+                    color='Transfer Score',
+                    color_continuous_scale='Blues',
+                    hover_data=['Outgoing Routes', 'Incoming Routes'],
+                    title='Airports Carrying the Most Two-flight Itineraries'
+                )
+                st.plotly_chart(fig, use_container_width=True)
+    
+            elif section == "On-Time Performance":
+                st.markdown('<div class="sub-header">On-Time Performance</div>', unsafe_allow_html=True)
+
+                # Delays and cancellations from local BTS On-Time files, aggregated once per file
+                ontime_version = ontime_data_version()
+                if ontime_version is None:
+                    st.info(f"Place BTS On-Time Performance CSV files (or their zip downloads) in the `{ONTIME_DIR}/` folder to analyse delays and cancellations.")
+                else:
+                    ontime = load_ontime_summary(ontime_version)
+                    ontime_summary = ontime["summary"]
+                    for path, error in ontime["skipped"]:
+                        st.warning(f"Skipped `{path}`: {error}")
+                    if airport_code not in ontime_airports(ontime_summary):
+                        st.info(f"The on-time files have no departures from {airport_code}.")
+                    else:
+                        by_airline = ontime_breakdown(ontime_summary, airport_code, "airline")
+                        by_hour = ontime_breakdown(ontime_summary, airport_code, "hour")
+                        by_destination = ontime_breakdown(ontime_summary, airport_code, "destination")
+
+                        totals = ontime_totals(ontime_summary, airport_code)
+                        col1, col2, col3, col4 = st.columns(4)
+                        with col1:
+                            st.metric("Departures", f"{totals['flights']:,}")
+                        with col2:
+                            st.metric("On Time", f"{totals['on_time_pct']:.1f}%")
+                        with col3:
+                            st.metric("Cancelled", f"{totals['cancelled_pct']:.1f}%")
+                        with col4:
+                            st.metric("Mean Arrival Delay", f"{totals['mean_delay']:.1f} min")
+                        st.caption(f"Aggregated from {len(ontime_version) - len(ontime['skipped'])} on-time file(s).")
+
+                        # Arrival delay distribution per airline
+                        st.subheader("Arrival Delay Distribution by Airline")
+                        delay_distribution = by_airline.nlargest(10, 'Flights')[DELAY_BIN_LABELS].rename_axis('Airline').reset_index().melt(
+                            id_vars='Airline', var_name='Arrival Delay', value_name='Flights'
+                        )
+                        fig = px.bar(
+                            delay_distribution,
+                            x='Airline',
+                            y='Flights',
+                            color='Arrival Delay',
+                            color_discrete_sequence=px.colors.sequential.Blues_r,
+                            title='Arrival Delays of the 10 Busiest Airlines'
+                        )
+                        st.plotly_chart(fig, use_container_width=True)
+
+                        # On-time rate across the day
+                        st.subheader("On-Time Rate by Scheduled Departure Hour")
+                        fig = px.line(
+                            by_hour.reset_index(),
+                            x='hour',
+                            y='On Time (%)',
+                            markers=True,
+                            hover_data=['Flights', 'Cancelled (%)', 'Mean Arrival Delay (min)'],
+                            title='On-Time Arrivals by Departure Hour'
+                        )
+                        fig.update_layout(xaxis_title='Scheduled Departure Hour (local)')
+                        st.plotly_chart(fig, use_container_width=True)
+
+                        # Routes with the longest average delays, among routes with a meaningful number of flights
+                        st.subheader("Most Delayed Destinations")
+                        busy_routes = by_destination[by_destination['Flights'] >= 30]
+                        st.dataframe(
+                            busy_routes.nlargest(10, 'Mean Arrival Delay (min)')[['Flights', 'Cancelled (%)', 'On Time (%)', 'Mean Arrival Delay (min)']],
+                            use_container_width=True
+                        )
+
+        problem1_sections()
     
     # Generate report section
     with st.expander("View Airport Analysis Report", expanded=False):
@@ -411,6 +933,14 @@ elif page == "Problem 1: Airport Analysis":
 
 # Problem 2: University Dashboard
 elif page == "Problem 2: University Dashboard":
+    import numpy as np
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from downsample import downsample_trends, trend_trace
+    from forecast import FORECAST_LEVEL
+    from student_store import ENROLLMENT_RECORDS_PATH, STUDENT_RECORDS_PATH, available_backends, student_records_available
+    from university_data import filter_department_data, filter_university_data, university_data_fingerprint
+
     st.markdown('<div class="main-header">Problem 2: University Dashboard</div>', unsafe_allow_html=True)
     
     st.markdown("""
@@ -419,47 +949,21 @@ elif page == "Problem 2: University Dashboard":
     satisfaction scores, and departmental breakdowns over time.
     """)
     
-    # Load the university data
-    @st.cache_data
-    def load_university_data():
-        try:
-            data = pd.read_csv("university_student_dashboard_data.csv")
-            return data
-        except Exception as e:
-            # Create sample data
-            np.random.seed(42)  # For reproducibility
-            years = range(2015, 2025)
-            terms = ["Spring", "Fall"]
-            data = []
-            for year in years:
-                for term in terms:
-                    base_apps = 2500 + (year - 2015) * 100
-                    base_retention = 85 + min((year - 2015), 5)
-                    base_satisfaction = 78 + min((year - 2015), 10)
-                    
-                    row = {
-                        "Year": year,
-                        "Term": term,
-                        "Applications": base_apps + np.random.randint(-50, 50),
-                        "Admitted": int(base_apps * 0.6) + np.random.randint(-30, 30),
-                        "Enrolled": int(base_apps * 0.25) + np.random.randint(-15, 15),
-                        "Retention Rate (%)": base_retention + np.random.randint(-2, 2),
-                        "Student Satisfaction (%)": base_satisfaction + np.random.randint(-2, 2),
-                        "Engineering Enrolled": int(base_apps * 0.25 * 0.33) + np.random.randint(-5, 5),
-                        "Business Enrolled": int(base_apps * 0.25 * 0.25) + np.random.randint(-5, 5),
-                        "Arts Enrolled": int(base_apps * 0.25 * 0.22) + np.random.randint(-5, 5),
-                        "Science Enrolled": int(base_apps * 0.25 * 0.20) + np.random.randint(-5, 5)
-                    }
-                    data.append(row)
-            return pd.DataFrame(data)
+    # Student-level records are aggregated per term by the selected query backend
+    backend = "pandas"
+    if student_records_available():
+        st.sidebar.markdown("## Student Records")
+        backend = st.sidebar.selectbox("Query backend:", available_backends())
+        st.caption(f"KPIs are aggregated from student-level records in `{STUDENT_RECORDS_PATH}` with the {backend} backend.")
     
-    university_data = load_university_data()
+    # Load the university data, sorted and indexed by (Year, Term)
+    university_index = load_university_data(backend)
     
     # Filter controls in sidebar
     st.sidebar.markdown("## Data Filters")
     
     # Year range filter
-    all_years = sorted(university_data['Year'].unique())
+    all_years = sorted(university_index['blocks']['Year'].unique())
     year_range = st.sidebar.slider(
         "Select Year Range:",
         min_value=min(all_years),
@@ -468,283 +972,349 @@ elif page == "Problem 2: University Dashboard":
     )
     
     # Term filter
-    terms = sorted(university_data['Term'].unique())
+    terms = sorted(university_index['blocks']['Term'].unique())
     selected_terms = st.sidebar.multiselect(
         "Select Terms:",
         terms,
         default=terms
     )
     
-    # Apply filters
-    filtered_data = university_data[
-        (university_data['Year'] >= year_range[0]) & 
-        (university_data['Year'] <= year_range[1]) &
-        (university_data['Term'].isin(selected_terms))
-    ]
+    # Apply filters as slices of the sorted table
+    filtered_data = filter_university_data(university_index, year_range, selected_terms)
     
-    # Create tabs for different sections
-    tab1, tab2, tab3 = st.tabs([
-        "Overview & KPIs", 
-        "Enrollment & Retention", 
-        "Departmental Analysis"
-    ])
+    # Figures are memoized per dataset version, filter state and chart, so revisiting a filter state skips rebuilding them
+    figure_cache = load_figure_cache()
+    filter_state = (university_index['version'], tuple(year_range), tuple(sorted(selected_terms)))
     
-    with tab1:
-        st.markdown('<div class="sub-header">University Admissions & Performance Overview</div>', unsafe_allow_html=True)
-        
-        # Create KPI metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        # Total applications
-        total_applications = filtered_data['Applications'].sum()
-        with col1:
-            st.metric("Total Applications", f"{total_applications:,}")
-        
-        # Total admissions
-        total_admissions = filtered_data['Admitted'].sum()
-        with col2:
-            st.metric("Total Admissions", f"{total_admissions:,}")
-        
-        # Total enrollments
-        total_enrollments = filtered_data['Enrolled'].sum()
-        with col3:
-            st.metric("Total Enrollments", f"{total_enrollments:,}")
-        
-        # Average acceptance rate
-        acceptance_rate = (total_admissions / total_applications * 100).round(1)
-        with col4:
-            st.metric("Acceptance Rate", f"{acceptance_rate}%")
-        
-        # Applications, Admissions, and Enrollments trends
-        st.subheader("Applications, Admissions, and Enrollments Over Time")
-        
-        # Prepare data for time series plot
-        time_series_data = filtered_data.copy()
-        time_series_data['Year-Term'] = time_series_data['Year'].astype(str) + '-' + time_series_data['Term']
-        time_series_data = time_series_data.sort_values(['Year', 'Term'])
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=time_series_data['Year-Term'],
-            y=time_series_data['Applications'],
-            mode='lines+markers',
-            name='Applications'
-        ))
-        fig.add_trace(go.Scatter(
-            x=time_series_data['Year-Term'],
-            y=time_series_data['Admitted'],
-            mode='lines+markers',
-            name='Admitted'
-        ))
-        fig.add_trace(go.Scatter(
-            x=time_series_data['Year-Term'],
-            y=time_series_data['Enrolled'],
-            mode='lines+markers',
-            name='Enrolled'
-        ))
-        fig.update_layout(
-            title='Admissions Trends Over Time',
-            xaxis_title='Year-Term',
-            yaxis_title='Count',
-            xaxis={'tickangle': 45}
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Acceptance and Enrollment Rates
-        st.subheader("Acceptance and Enrollment Rates Over Time")
-        
-        time_series_data['Acceptance Rate'] = (time_series_data['Admitted'] / time_series_data['Applications'] * 100).round(1)
-        time_series_data['Enrollment Rate'] = (time_series_data['Enrolled'] / time_series_data['Admitted'] * 100).round(1)
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=time_series_data['Year-Term'],
-            y=time_series_data['Acceptance Rate'],
-            mode='lines+markers',
-            name='Acceptance Rate (%)'
-        ))
-        fig.add_trace(go.Scatter(
-            x=time_series_data['Year-Term'],
-            y=time_series_data['Enrollment Rate'],
-            mode='lines+markers',
-            name='Enrollment Rate (%)'
-        ))
-        fig.update_layout(
-            title='Acceptance and Enrollment Rates Over Time',
-            xaxis_title='Year-Term',
-            yaxis_title='Rate (%)',
-            xaxis={'tickangle': 45}
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    def filtered_figure(chart_id, build):
+        return figure_cache.get((*filter_state, chart_id), build)
     
-    with tab2:
-        st.markdown('<div class="sub-header">Enrollment & Retention Analysis</div>', unsafe_allow_html=True)
-        
-        # Student Retention and Satisfaction
-        st.subheader("Student Retention and Satisfaction Trends")
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=time_series_data['Year-Term'],
-            y=time_series_data['Retention Rate (%)'],
-            mode='lines+markers',
-            name='Retention Rate (%)'
-        ))
-        fig.add_trace(go.Scatter(
-            x=time_series_data['Year-Term'],
-            y=time_series_data['Student Satisfaction (%)'],
-            mode='lines+markers',
-            name='Satisfaction (%)'
-        ))
-        fig.update_layout(
-            title='Student Retention and Satisfaction Over Time',
-            xaxis_title='Year-Term',
-            yaxis_title='Percentage (%)',
-            xaxis={'tickangle': 45}
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Spring vs Fall Comparison
-        st.subheader("Spring vs. Fall Term Comparison")
-        
-        # Group by term
-        term_comparison = filtered_data.groupby('Term').agg({
-            'Applications': 'mean',
-            'Admitted': 'mean',
-            'Enrolled': 'mean',
-            'Retention Rate (%)': 'mean',
-            'Student Satisfaction (%)': 'mean'
-        }).reset_index()
-        
-        metrics = ['Applications', 'Admitted', 'Enrolled', 'Retention Rate (%)', 'Student Satisfaction (%)']
-        
-        fig = go.Figure()
-        for metric in metrics:
-            fig.add_trace(go.Bar(
-                x=term_comparison['Term'],
-                y=term_comparison[metric],
-                text=term_comparison[metric].round(1),
-                textposition='auto',
-                name=metric
-            ))
-        
-        fig.update_layout(
-            title='Spring vs. Fall Term Comparison',
-            xaxis_title='Term',
-            yaxis_title='Average Value',
-            barmode='group'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    # Time series of the filtered terms, used by the trend charts. The filtered rows are already in (Year, Term)
+    # order, so it only adds the Year-Term label; it is built on the first figure miss of a filter state and
+    # shared read-only like the figures.
+    def load_time_series():
+        def build():
+            return filtered_data.assign(**{'Year-Term': filtered_data['Year'].astype(str) + '-' + filtered_data['Term']})
+        return figure_cache.get((*filter_state, 'time_series'), build)
     
-    with tab3:
-        st.markdown('<div class="sub-header">Departmental Analysis</div>', unsafe_allow_html=True)
-        
-        # Department enrollment breakdown
-        st.subheader("Enrollment by Department")
-        
-        # Reshape data for department analysis
-        dept_data = filtered_data.copy()
-        
-        # Calculate total department enrollments
-        total_eng = dept_data['Engineering Enrolled'].sum()
-        total_bus = dept_data['Business Enrolled'].sum()
-        total_arts = dept_data['Arts Enrolled'].sum()
-        total_sci = dept_data['Science Enrolled'].sum()
-        
-        # Create pie chart of overall department distribution
-        dept_labels = ['Engineering', 'Business', 'Arts', 'Science']
-        dept_values = [total_eng, total_bus, total_arts, total_sci]
-        
-        fig = px.pie(
-            values=dept_values,
-            names=dept_labels,
-            title='Overall Enrollment by Department',
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Department trends over time
-        st.subheader("Department Enrollment Trends")
-        
-        # Prepare data for time series
-        dept_data['Year-Term'] = dept_data['Year'].astype(str) + '-' + dept_data['Term']
-        dept_data = dept_data.sort_values(['Year', 'Term'])
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=dept_data['Year-Term'],
-            y=dept_data['Engineering Enrolled'],
-            mode='lines+markers',
-            name='Engineering'
-        ))
-        fig.add_trace(go.Scatter(
-            x=dept_data['Year-Term'],
-            y=dept_data['Business Enrolled'],
-            mode='lines+markers',
-            name='Business'
-        ))
-        fig.add_trace(go.Scatter(
-            x=dept_data['Year-Term'],
-            y=dept_data['Arts Enrolled'],
-            mode='lines+markers',
-            name='Arts'
-        ))
-        fig.add_trace(go.Scatter(
-            x=dept_data['Year-Term'],
-            y=dept_data['Science Enrolled'],
-            mode='lines+markers',
-            name='Science'
-        ))
-        fig.update_layout(
-            title='Department Enrollment Trends Over Time',
-            xaxis_title='Year-Term',
-            yaxis_title='Number of Students',
-            xaxis={'tickangle': 45}
-        )
-        st.plotly_chart(fig)
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Department comparison by year
-        st.subheader("Department Comparison by Year")
-        
-        year_dept = filtered_data.groupby('Year').agg({
-            'Engineering Enrolled': 'sum',
-            'Business Enrolled': 'sum',
-            'Arts Enrolled': 'sum',
-            'Science Enrolled': 'sum'
-        }).reset_index()
-        
-        # Prepare data for stacked bar chart
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=year_dept['Year'],
-            y=year_dept['Engineering Enrolled'],
-            name='Engineering'
-        ))
-        fig.add_trace(go.Bar(
-            x=year_dept['Year'],
-            y=year_dept['Business Enrolled'],
-            name='Business'
-        ))
-        fig.add_trace(go.Bar(
-            x=year_dept['Year'],
-            y=year_dept['Arts Enrolled'],
-            name='Arts'
-        ))
-        fig.add_trace(go.Bar(
-            x=year_dept['Year'],
-            y=year_dept['Science Enrolled'],
-            name='Science'
-        ))
-        
-        fig.update_layout(
-            title='Enrollment by Department and Year',
-            xaxis_title='Year',
-            yaxis_title='Number of Students',
-            barmode='stack'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    # Only the selected section runs, and switching sections reruns this fragment alone
+    @st.fragment
+    def problem2_sections():
+        section = lazy_tabs([
+            "Overview & KPIs", 
+            "Enrollment & Retention", 
+            "Departmental Analysis",
+            "Cohort Retention",
+            "Forecasts"
+        ], key="problem2_sections")
+    
+        if section == "Overview & KPIs":
+            st.markdown('<div class="sub-header">University Admissions & Performance Overview</div>', unsafe_allow_html=True)
+        
+            # Create KPI metrics
+            col1, col2, col3, col4 = st.columns(4)
+        
+            # Total applications
+            total_applications = filtered_data['Applications'].sum()
+            with col1:
+                st.metric("Total Applications", f"{total_applications:,}")
+        
+            # Total admissions
+            total_admissions = filtered_data['Admitted'].sum()
+            with col2:
+                st.metric("Total Admissions", f"{total_admissions:,}")
+        
+            # Total enrollments
+            total_enrollments = filtered_data['Enrolled'].sum()
+            with col3:
+                st.metric("Total Enrollments", f"{total_enrollments:,}")
+        
+            # Average acceptance rate
+            acceptance_rate = (total_admissions / total_applications * 100).round(1)
+            with col4:
+                st.metric("Acceptance Rate", f"{acceptance_rate}%")
+        
+            # Applications, Admissions, and Enrollments trends
+            st.subheader("Applications, Admissions, and Enrollments Over Time")
+        
+            def build_admissions_trends():
+                fig = go.Figure()
+                trend = downsample_trends(load_time_series(), ['Applications', 'Admitted', 'Enrolled'])
+                fig.add_trace(trend_trace(trend['Year-Term'], trend['Applications'], 'Applications'))
+                fig.add_trace(trend_trace(trend['Year-Term'], trend['Admitted'], 'Admitted'))
+                fig.add_trace(trend_trace(trend['Year-Term'], trend['Enrolled'], 'Enrolled'))
+                fig.update_layout(
+                    title='Admissions Trends Over Time',
+                    xaxis_title='Year-Term',
+                    yaxis_title='Count',
+                    xaxis={'tickangle': 45}
+                )
+                return fig
+            st.plotly_chart(filtered_figure('admissions_trends', build_admissions_trends), use_container_width=True)
+        
+            # Acceptance and Enrollment Rates
+            st.subheader("Acceptance and Enrollment Rates Over Time")
+        
+            def build_admission_rates():
+                time_series_data = load_time_series()
+                time_series_data = time_series_data.assign(**{
+                    'Acceptance Rate': (time_series_data['Admitted'] / time_series_data['Applications'] * 100).round(1),
+                    'Enrollment Rate': (time_series_data['Enrolled'] / time_series_data['Admitted'] * 100).round(1)
+                })
+        
+                fig = go.Figure()
+                trend = downsample_trends(time_series_data, ['Acceptance Rate', 'Enrollment Rate'])
+                fig.add_trace(trend_trace(trend['Year-Term'], trend['Acceptance Rate'], 'Acceptance Rate (%)'))
+                fig.add_trace(trend_trace(trend['Year-Term'], trend['Enrollment Rate'], 'Enrollment Rate (%)'))
+                fig.update_layout(
+                    title='Acceptance and Enrollment Rates Over Time',
+                    xaxis_title='Year-Term',
+                    yaxis_title='Rate (%)',
+                    xaxis={'tickangle': 45}
+                )
+                return fig
+            st.plotly_chart(filtered_figure('admission_rates', build_admission_rates), use_container_width=True)
+        
+            # What-if simulation of next year's admissions funnel
+            st.subheader("Admissions What-If Simulator")
+            scenarios = load_funnel_scenarios(university_index['version'], university_index['data'])
+            historical_admit_rate = float(scenarios['history']['Admit Rate'].mean())
+            col1, col2 = st.columns(2)
+            with col1:
+                admit_rate = st.slider(
+                    "Target admit rate (%):", 10, 100, int(round(historical_admit_rate * 100)), key="problem2_admit_rate"
+                ) / 100
+            with col2:
+                capacity_factor = st.slider(
+                    "Capacity (% of peak term enrollment):", 50, 200, 110, step=5, key="problem2_capacity"
+                ) / 100
+        
+            simulation = load_funnel_summary(university_index['version'], admit_rate, capacity_factor, scenarios)
+            low, median, high = simulation['percentiles']
+        
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Median Next-Year Enrollment", f"{median:,.0f}")
+            with col2:
+                st.metric("90% Range", f"{low:,.0f} – {high:,.0f}")
+            with col3:
+                st.metric("Chance of Exceeding Capacity", f"{simulation['overflow_probability']:.1%}")
+            st.caption(
+                f"{simulation['n_scenarios']:,} scenarios across {', '.join(scenarios['terms'])} terms. "
+                f"Historical admit rate {historical_admit_rate:.1%}; expected overflow {simulation['expected_overflow']:,.0f} students."
+            )
+        
+            counts, edges = simulation['histogram']
+            fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts / counts.sum(), width=np.diff(edges), name='Scenarios'))
+            fig.add_vline(x=simulation['capacity'], line_dash='dash', annotation_text='Capacity')
+            fig.update_layout(
+                title='Simulated Next-Year Enrollment',
+                xaxis_title='Enrolled Students',
+                yaxis_title='Share of Scenarios',
+                bargap=0
+            )
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(simulation['department_outlook'], use_container_width=True)
+    
+        elif section == "Enrollment & Retention":
+            st.markdown('<div class="sub-header">Enrollment & Retention Analysis</div>', unsafe_allow_html=True)
+        
+            # Student Retention and Satisfaction
+            st.subheader("Student Retention and Satisfaction Trends")
+        
+            def build_retention_satisfaction():
+                fig = go.Figure()
+                trend = downsample_trends(load_time_series(), ['Retention Rate (%)', 'Student Satisfaction (%)'])
+                fig.add_trace(trend_trace(trend['Year-Term'], trend['Retention Rate (%)'], 'Retention Rate (%)'))
+                fig.add_trace(trend_trace(trend['Year-Term'], trend['Student Satisfaction (%)'], 'Satisfaction (%)'))
+                fig.update_layout(
+                    title='Student Retention and Satisfaction Over Time',
+                    xaxis_title='Year-Term',
+                    yaxis_title='Percentage (%)',
+                    xaxis={'tickangle': 45}
+                )
+                return fig
+            st.plotly_chart(filtered_figure('retention_satisfaction', build_retention_satisfaction), use_container_width=True)
+        
+            # Spring vs Fall Comparison
+            st.subheader("Spring vs. Fall Term Comparison")
+        
+            def build_term_comparison():
+                # Group by term
+                term_comparison = filtered_data.groupby('Term').agg({
+                    'Applications': 'mean',
+                    'Admitted': 'mean',
+                    'Enrolled': 'mean',
+                    'Retention Rate (%)': 'mean',
+                    'Student Satisfaction (%)': 'mean'
+                }).reset_index()
+        
+                metrics = ['Applications', 'Admitted', 'Enrolled', 'Retention Rate (%)', 'Student Satisfaction (%)']
+        
+                fig = go.Figure()
+                for metric in metrics:
+                    fig.add_trace(go.Bar(
+                        x=term_comparison['Term'],
+                        y=term_comparison[metric],
+                        text=term_comparison[metric].round(1),
+                        textposition='auto',
+                        name=metric
+                    ))
+        
+                fig.update_layout(
+                    title='Spring vs. Fall Term Comparison',
+                    xaxis_title='Term',
+                    yaxis_title='Average Value',
+                    barmode='group'
+                )
+                return fig
+            st.plotly_chart(filtered_figure('term_comparison', build_term_comparison), use_container_width=True)
+    
+        elif section == "Departmental Analysis":
+            st.markdown('<div class="sub-header">Departmental Analysis</div>', unsafe_allow_html=True)
+        
+            # Department enrollment breakdown
+            st.subheader("Enrollment by Department")
+        
+            # Long department rows of the filter, aggregated once per (Year, Term, Department); every chart below
+            # is derived from this table, so it handles any number of departments
+            dept_data = filter_department_data(university_index, year_range, selected_terms)
+            dept_by_term = dept_data.groupby(['Year', 'Term', 'Department'], observed=True)['Enrolled'].sum()
+        
+            def build_department_share():
+                # Create pie chart of overall department distribution
+                dept_totals = dept_by_term.groupby(level='Department', observed=True).sum()
+                fig = px.pie(
+                    values=dept_totals.to_numpy(),
+                    names=dept_totals.index.astype(str),
+                    title='Overall Enrollment by Department',
+                    color_discrete_sequence=px.colors.qualitative.Set3
+                )
+                fig.update_traces(textposition='inside', textinfo='percent+label')
+                return fig
+            st.plotly_chart(filtered_figure('department_share', build_department_share), use_container_width=True)
+        
+            # Department trends over time
+            st.subheader("Department Enrollment Trends")
+        
+            def build_department_trends():
+                # One column per department, one row per Year-Term
+                trend_data = dept_by_term.unstack('Department')
+                departments = list(trend_data.columns)
+                trend_data = trend_data.reset_index()
+                trend_data['Year-Term'] = trend_data['Year'].astype(str) + '-' + trend_data['Term']
+        
+                fig = go.Figure()
+                trend_data = downsample_trends(trend_data, departments)
+                for department in departments:
+                    fig.add_trace(trend_trace(trend_data['Year-Term'], trend_data[department], department))
+                fig.update_layout(
+                    title='Department Enrollment Trends Over Time',
+                    xaxis_title='Year-Term',
+                    yaxis_title='Number of Students',
+                    xaxis={'tickangle': 45}
+                )
+                return fig
+            st.plotly_chart(filtered_figure('department_trends', build_department_trends), use_container_width=True)
+        
+            # Department comparison by year
+            st.subheader("Department Comparison by Year")
+        
+            def build_department_by_year():
+                year_dept = dept_by_term.groupby(level=['Year', 'Department'], observed=True).sum().reset_index()
+                year_dept['Department'] = year_dept['Department'].astype(str)
+        
+                # Stacked bar chart, one segment per department
+                fig = px.bar(year_dept, x='Year', y='Enrolled', color='Department')
+                fig.update_layout(
+                    title='Enrollment by Department and Year',
+                    xaxis_title='Year',
+                    yaxis_title='Number of Students',
+                    barmode='stack'
+                )
+                return fig
+            st.plotly_chart(filtered_figure('department_by_year', build_department_by_year), use_container_width=True)
+    
+        elif section == "Cohort Retention":
+            st.markdown('<div class="sub-header">Cohort Retention</div>', unsafe_allow_html=True)
+        
+            enrollment_fingerprint = university_data_fingerprint(ENROLLMENT_RECORDS_PATH)
+            if enrollment_fingerprint is None:
+                st.info(
+                    f"Cohort retention needs enrollment records in `{ENROLLMENT_RECORDS_PATH}` "
+                    "(one row per student and enrolled term: StudentID, Year, Term)."
+                )
+            else:
+                cohorts = load_cohort_retention(enrollment_fingerprint)
+                st.markdown("""
+                Each row is the cohort of students who first enrolled in that term; each column is the share of the
+                cohort still enrolled that many terms later.
+                """)
+                fig = px.imshow(
+                    cohorts.drop(columns='Students'),
+                    color_continuous_scale='Blues',
+                    zmin=0,
+                    zmax=100,
+                    text_auto='.0f',
+                    aspect='auto',
+                    labels={'x': 'Terms Since Entry', 'y': 'Entry Term', 'color': 'Retained (%)'},
+                    title='Retention by Entry Cohort'
+                )
+                st.plotly_chart(fig, use_container_width=True)
+                st.caption(f"{cohorts['Students'].sum():,} students in {len(cohorts)} entry cohorts.")
+    
+        elif section == "Forecasts":
+            st.markdown('<div class="sub-header">Next-Year Forecasts</div>', unsafe_allow_html=True)
+            st.markdown(f"""
+            Each series is extrapolated with a linear trend per term, fitted on the full history.
+            Bands are {FORECAST_LEVEL:.0%} prediction intervals.
+            """)
+        
+            # Metrics come from the unfiltered forecast, so the selection stays valid when the terms change
+            all_forecasts = load_university_forecast(university_index['version'], university_index['data'])
+            metric = st.selectbox("Metric:", all_forecasts['Metric'].unique(), key="problem2_forecast_metric")
+            forecast = all_forecasts[all_forecasts['Term'].isin(selected_terms)]
+        
+            if not selected_terms or metric is None:
+                st.info("Select at least one term and a metric to see forecasts.")
+            else:
+                def build_forecast():
+                    fig = go.Figure()
+                    for term, history in filtered_data.groupby('Term', sort=True):
+                        predicted = forecast[(forecast['Term'] == term) & (forecast['Metric'] == metric)]
+                        fig.add_trace(go.Scatter(
+                            x=history['Year'],
+                            y=history[metric],
+                            mode='lines+markers',
+                            name=f'{term} history'
+                        ))
+                        fig.add_trace(go.Scatter(
+                            x=predicted['Year'],
+                            y=predicted['Forecast'],
+                            error_y={
+                                'type': 'data',
+                                'symmetric': False,
+                                'array': predicted['Upper'] - predicted['Forecast'],
+                                'arrayminus': predicted['Forecast'] - predicted['Lower']
+                            },
+                            mode='markers',
+                            marker={'symbol': 'diamond', 'size': 10},
+                            name=f'{term} forecast'
+                        ))
+                    fig.update_layout(
+                        title=f'{metric}: History and Next-Year Forecast',
+                        xaxis_title='Year',
+                        yaxis_title=metric
+                    )
+                    return fig
+                st.plotly_chart(filtered_figure(f'forecast:{metric}', build_forecast), use_container_width=True)
+        
+                st.dataframe(
+                    forecast.pivot_table(index='Metric', columns=['Year', 'Term'], values=['Forecast', 'Lower', 'Upper'], sort=False).round(1),
+                    use_container_width=True
+                )
+
+    problem2_sections()
     
     # Summary insights section
     with st.expander("View University Dashboard Insights", expanded=False):
@@ -792,6 +1362,13 @@ elif page == "Problem 2: University Dashboard":
 
 # Problem 3: Data Visualization Comparison
 elif page == "Problem 3: Data Visualization Comparison":
+    import io
+    import numpy as np
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from figure_cache import code_digest, frame_digest
+    from sklearn.linear_model import LinearRegression
+
     st.markdown('<div class="main-header">Problem 3: Data Visualization Comparison</div>', unsafe_allow_html=True)
     
     st.markdown("""
@@ -800,554 +1377,439 @@ elif page == "Problem 3: Data Visualization Comparison":
     data from 2022 to explore the relationship between GDP per capita and happiness scores.
     """)
     
-    # Load the dataset
-    @st.cache_data
-    def load_happiness_data():
-        try:
-            # Attempt to load the actual data
-            df = pd.read_csv('2022.csv', decimal=',')
-            # Clean up column names
-            df.columns = ['RANK', 'Country', 'Happiness_score', 'Whisker_high', 'Whisker_low', 
-                         'Dystopia_residual', 'GDP_per_capita', 'Social_support', 
-                         'Healthy_life_expectancy', 'Freedom', 'Generosity', 'Corruption']
-            # Remove last row if it contains 'xx' placeholder
-            df = df[df['Country'] != 'xx']
-            # Convert rank to numeric
-            df['RANK'] = pd.to_numeric(df['RANK'])
-        except Exception as e:
-            # Create synthetic data for demonstration
-            np.random.seed(42)
-            countries = [
-                # Europe
-                'Finland', 'Denmark', 'Iceland', 'Switzerland', 'Netherlands',
-                'Luxembourg', 'Sweden', 'Norway', 'Austria', 'Ireland',
-                # North America
-                'Canada', 'United States',
-                # Latin America
-                'Costa Rica', 'Mexico', 'Brazil', 'Chile', 'Argentina',
-                # Asia & Pacific
-                'New Zealand', 'Australia', 'Israel', 'Singapore', 'Japan',
-                'South Korea', 'Thailand', 'China', 'Vietnam', 'Indonesia',
-                # Middle East
-                'United Arab Emirates', 'Saudi Arabia', 'Bahrain', 'Kuwait',
-                # Africa
-                'Mauritius', 'South Africa', 'Morocco', 'Algeria', 'Ghana',
-                'Kenya', 'Nigeria', 'Ethiopia', 'Rwanda', 'Zimbabwe'
-            ]
-            
-            data = []
-            for i, country in enumerate(countries):
-                # European and North American countries tend to be happier
-                base_happiness = 7.0 if country in ['Finland', 'Denmark', 'Iceland', 'Switzerland', 'Netherlands',
-                                               'Luxembourg', 'Sweden', 'Norway', 'Austria', 'Ireland',
-                                               'Canada', 'United States'] else 5.0
-                
-                # Adjust happiness based on region
-                if country in ['Costa Rica', 'Mexico']:  # Latin American "happiness paradox"
-                    base_happiness += 1.5
-                elif country in ['Brazil', 'Chile', 'Argentina']:
-                    base_happiness += 0.8
-                elif country in ['New Zealand', 'Australia', 'Israel', 'Singapore']:
-                    base_happiness += 1.0
-                elif country in ['Japan', 'South Korea']:
-                    base_happiness += 0.3
-                elif country in ['United Arab Emirates', 'Saudi Arabia', 'Bahrain', 'Kuwait']:
-                    base_happiness += 0.4
-                elif country in ['Zimbabwe', 'Ethiopia', 'Rwanda']:
-                    base_happiness -= 2.0
-                
-                # GDP per capita (roughly correlated with happiness)
-                base_gdp = 1.8 if country in ['Finland', 'Denmark', 'Iceland', 'Switzerland', 'Netherlands',
-                                        'Luxembourg', 'Sweden', 'Norway', 'Austria', 'Ireland',
-                                        'Canada', 'United States', 'New Zealand', 'Australia', 
-                                        'Israel', 'Singapore', 'United Arab Emirates'] else 1.0
-                
-                # Adjust GDP for specific countries
-                if country in ['Luxembourg', 'Switzerland', 'Norway']:
-                    base_gdp += 0.3
-                elif country in ['Zimbabwe', 'Ethiopia', 'Rwanda']:
-                    base_gdp -= 0.5
-                
-                # Add random variation
-                happiness = base_happiness + np.random.uniform(-0.5, 0.5)
-                gdp = base_gdp + np.random.uniform(-0.2, 0.2)
-                
-                # Rank is based on happiness score
-                rank = i + 1
-                
-                # Create country data
-                row = {
-                    'RANK': rank,
-                    'Country': country,
-                    'Happiness_score': happiness,
-                    'GDP_per_capita': gdp,
-                    'Social_support': np.random.uniform(0.5, 1.5),
-                    'Healthy_life_expectancy': np.random.uniform(0.5, 1.5),
-                    'Freedom': np.random.uniform(0.5, 1.5),
-                    'Generosity': np.random.uniform(-0.2, 0.5),
-                    'Corruption': np.random.uniform(0, 0.5)
-                }
-                data.append(row)
-            
-            df = pd.DataFrame(data)
-        
-        # Create region classification
-        def assign_region(country):
-            europe = ['Finland', 'Denmark', 'Iceland', 'Switzerland', 'Netherlands', 'Luxembourg', 
-                     'Sweden', 'Norway', 'Austria', 'Ireland', 'Germany', 'Czechia', 'Belgium', 
-                     'Slovenia', 'United Kingdom', 'France', 'Estonia', 'Spain', 'Italy', 'Lithuania',
-                     'Slovakia', 'Latvia', 'Romania', 'Croatia', 'Poland', 'Portugal', 'Greece', 
-                     'Cyprus', 'Serbia', 'Hungary', 'Montenegro', 'Bulgaria', 'Albania', 'North Macedonia']
-            
-            north_america = ['Canada', 'United States']
-            
-            latin_america = ['Costa Rica', 'Uruguay', 'Panama', 'Brazil', 'Guatemala', 'Chile', 
-                            'Nicaragua', 'Mexico', 'El Salvador', 'Honduras', 'Paraguay', 'Peru', 
-                            'Ecuador', 'Bolivia', 'Venezuela', 'Colombia', 'Argentina', 'Dominican Republic']
-            
-            asia_pacific = ['New Zealand', 'Australia', 'Israel', 'Singapore', 'Taiwan Province of China', 
-                           'Japan', 'South Korea', 'Hong Kong S.A.R. of China', 'Thailand', 'Philippines', 
-                           'Malaysia', 'Vietnam', 'Indonesia', 'China', 'Mongolia', 'Cambodia', 'Myanmar', 
-                           'Nepal', 'Laos', 'Bangladesh', 'Sri Lanka', 'India', 'Pakistan']
-            
-            middle_east = ['Bahrain', 'United Arab Emirates', 'Saudi Arabia', 'Kuwait', 'Turkey', 
-                          'Libya', 'Azerbaijan', 'Jordan', 'Lebanon', 'Iran', 'Iraq', 'Palestinian Territories']
-            
-            africa = ['Mauritius', 'South Africa', 'Algeria', 'Morocco', 'Cameroon', 'Senegal', 
-                     'Ghana', 'Niger', 'Gabon', 'Guinea', 'Burkina Faso', 'Benin', 'Comoros', 
-                     'Uganda', 'Nigeria', 'Kenya', 'Tunisia', 'Namibia', 'Mali', 'Eswatini, Kingdom of', 
-                     'Madagascar', 'Egypt', 'Chad', 'Ethiopia', 'Mauritania', 'Togo', 'Zambia', 
-                     'Malawi', 'Tanzania', 'Sierra Leone', 'Lesotho', 'Botswana', 'Rwanda', 'Zimbabwe']
-            
-            former_soviet = ['Kosovo', 'Kazakhstan', 'Moldova', 'Belarus', 'Russia', 'Armenia', 
-                            'Tajikistan', 'Kyrgyzstan', 'Ukraine', 'Georgia', 'Turkmenistan', 
-                            'Uzbekistan']
-            
-            if country in europe:
-                return 'Europe'
-            elif country in north_america:
-                return 'North America'
-            elif country in latin_america:
-                return 'Latin America'
-            elif country in asia_pacific:
-                return 'Asia & Pacific'
-            elif country in middle_east:
-                return 'Middle East'
-            elif country in africa:
-                return 'Africa'
-            elif country in former_soviet:
-                return 'Former Soviet States'
-            else:
-                return 'Other'
-
-        # Apply region classification
-        df['Region'] = df['Country'].apply(assign_region)
-        
-        return df
-    
     # Load the happiness data
     happiness_data = load_happiness_data()
     
-    # Create tabs for different visualizations
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "Poor Visualization", 
-        "Improved Visualization", 
-        "Comparison & Analysis",
-        "Conclusion"
-    ])
+    # Images are cached by (data hash, render code and library versions, figure id, seed, dpi, size), so a
+    # section switch only renders on a miss.
+    # Each one renders inside its own rc_context, so style changes (sns.set_style) don't leak into other images.
+    image_cache = load_image_cache()
+    happiness_digest = frame_digest(happiness_data)
     
-    with tab1:
-        st.markdown('<div class="sub-header">Poor Visualization Example</div>', unsafe_allow_html=True)
-        
-        st.markdown("""
-        This visualization demonstrates several poor practices in data visualization, including:
-        
-        - Using an unnecessary 3D plot with a meaningless Z dimension
-        - Poor color choices with low contrast between regions
-        - Overwhelming the viewer with too many labels
-        - Confusing title and axis labels
-        - Misleading annotations
-        - Distracting grid lines and poor viewing angle
-        """)
-        
-        # Create a poor visualization
-        fig = plt.figure(figsize=(10, 8))
-        ax = fig.add_subplot(111, projection='3d')
-        
-        # Create a color map with poor contrast
-        region_colors = {
-            'Europe': 'lightblue',
-            'North America': 'lightcyan',
-            'Latin America': 'powderblue', 
-            'Asia & Pacific': 'paleturquoise',
-            'Middle East': 'azure',
-            'Africa': 'aliceblue',
-            'Former Soviet States': 'ghostwhite',
-            'Other': 'whitesmoke'
-        }
-        
-        # Get the data points with unnecessary jitter
-        x = happiness_data['GDP_per_capita'] + np.random.normal(0, 0.05, len(happiness_data))
-        y = happiness_data['Happiness_score']
-        z = np.zeros_like(x)  # Unnecessary third dimension
-        
-        # Plot points with poor readability
-        for region in region_colors:
-            region_data = happiness_data[happiness_data['Region'] == region]
-            if len(region_data) > 0:
-                ax.scatter(
-                    region_data['GDP_per_capita'] + np.random.normal(0, 0.05, len(region_data)),
-                    region_data['Happiness_score'],
-                    np.zeros_like(region_data['GDP_per_capita']),
-                    color=region_colors[region],
-                    s=60,
-                    label=region,
-                    alpha=0.7
-                )
-        
-        # Add labels to every point creating clutter
-        for i, country in enumerate(happiness_data['Country']):
-            ax.text(x[i], y[i], z[i], country, fontsize=7)
-        
-        # Confusing and overwhelming title
-        ax.set_title('GDP PER CAPITA CONTRIBUTION TO HAPPINESS SCORE VS OVERALL HAPPINESS SCORE FOR COUNTRIES IN 2022 WORLD HAPPINESS REPORT WITH REGIONAL CLASSIFICATION', fontsize=10)
-        
-        # Misleading axis labels
-        ax.set_xlabel('GDP contribution (not actual GDP per capita!)', fontsize=8)
-        ax.set_ylabel('Happiness Score?', fontsize=8)
-        ax.set_zlabel('No data on this axis', fontsize=8)
-        
-        # Add distracting grid
-        ax.grid(True, linestyle='-', linewidth=1.5, alpha=0.7)
-        
-        # Use a confusing viewing angle
-        ax.view_init(elev=30, azim=45)
-        
-        # Add an oversized legend
-        ax.legend(title='REGIONS OF THE WORLD', loc='upper center', 
-                 bbox_to_anchor=(0.5, 1), ncol=3, fontsize=8)
-        
-        # Add misleading annotations
-        ax.text(2.0, 7.5, 0, 'Rich countries are happier?', fontsize=12, color='red')
-        ax.text(0.7, 3.0, 0, 'Poor countries = Sad countries', fontsize=12, color='red')
-        
-        # Display the poor visualization
-        buffer = io.BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        st.image(buffer, use_column_width=True)
-        plt.close()
+    def cached_image(figure_id, render):
+        def render_with_default_style():
+            with plt.rc_context():
+                return render()
+        key = (happiness_digest, code_digest(render), plt.matplotlib.__version__, sns.__version__,
+               figure_id, JITTER_SEED, FIGURE_DPI, FIGURE_SIZES[figure_id])
+        return image_cache.get(key, render_with_default_style)
+    
+    # Only the selected section runs, and switching sections reruns this fragment alone
+    @st.fragment
+    def problem3_sections():
+        section = lazy_tabs([
+            "Poor Visualization", 
+            "Improved Visualization", 
+            "Comparison & Analysis",
+            "Conclusion"
+        ], key="problem3_sections")
     
-    with tab2:
-        st.markdown('<div class="sub-header">Improved Visualization Example</div>', unsafe_allow_html=True)
+        if section == "Poor Visualization":
+            st.markdown('<div class="sub-header">Poor Visualization Example</div>', unsafe_allow_html=True)
+        
+            st.markdown("""
+            This visualization demonstrates several poor practices in data visualization, including:
+        
+            - Using an unnecessary 3D plot with a meaningless Z dimension
+            - Poor color choices with low contrast between regions
+            - Overwhelming the viewer with too many labels
+            - Confusing title and axis labels
+            - Misleading annotations
+            - Distracting grid lines and poor viewing angle
+            """)
+        
+            # Create a poor visualization
+            def render_poor_visualization():
+                fig = plt.figure(figsize=FIGURE_SIZES['poor'])
+                rng = np.random.default_rng(JITTER_SEED)
+                ax = fig.add_subplot(111, projection='3d')
+        
+                # Create a color map with poor contrast
+                region_colors = {
+                    'Europe': 'lightblue',
+                    'North America': 'lightcyan',
+                    'Latin America': 'powderblue', 
+                    'Asia & Pacific': 'paleturquoise',
+                    'Middle East': 'azure',
+                    'Africa': 'aliceblue',
+                    'Former Soviet States': 'ghostwhite',
+                    'Other': 'whitesmoke'
+                }
         
-        st.markdown("""
-        This improved visualization addresses the issues in the poor example by:
-        
-        - Using a clear 2D scatter plot with appropriate dimensions
-        - Choosing distinct colors for different regions
-        - Selectively labeling only key countries to avoid clutter
-        - Providing a clear, concise title and accurate axis labels
-        - Adding thoughtful annotations that provide genuine insights
-        - Using a clean, professional styling
-        """)
+                # Get the data points with unnecessary jitter
+                x = happiness_data['GDP_per_capita'] + rng.normal(0, 0.05, len(happiness_data))
+                y = happiness_data['Happiness_score']
+                z = np.zeros_like(x)  # Unnecessary third dimension
+        
+                # Plot points with poor readability
+                for region in region_colors:
+                    region_data = happiness_data[happiness_data['Region'] == region]
+                    if len(region_data) > 0:
+                        ax.scatter(
+                            region_data['GDP_per_capita'] + rng.normal(0, 0.05, len(region_data)),
+                            region_data['Happiness_score'],
+                            np.zeros_like(region_data['GDP_per_capita']),
+                            color=region_colors[region],
+                            s=60,
+                            label=region,
+                            alpha=0.7
+                        )
+        
+                # Add labels to every point creating clutter
+                for i, country in enumerate(happiness_data['Country']):
+                    ax.text(x[i], y[i], z[i], country, fontsize=7)
+        
+                # Confusing and overwhelming title
+                ax.set_title('GDP PER CAPITA CONTRIBUTION TO HAPPINESS SCORE VS OVERALL HAPPINESS SCORE FOR COUNTRIES IN 2022 WORLD HAPPINESS REPORT WITH REGIONAL CLASSIFICATION', fontsize=10)
+        
+                # Misleading axis labels
+                ax.set_xlabel('GDP contribution (not actual GDP per capita!)', fontsize=8)
+                ax.set_ylabel('Happiness Score?', fontsize=8)
+                ax.set_zlabel('No data on this axis', fontsize=8)
+        
+                # Add distracting grid
+                ax.grid(True, linestyle='-', linewidth=1.5, alpha=0.7)
+        
+                # Use a confusing viewing angle
+                ax.view_init(elev=30, azim=45)
+        
+                # Add an oversized legend
+                ax.legend(title='REGIONS OF THE WORLD', loc='upper center', 
+                         bbox_to_anchor=(0.5, 1), ncol=3, fontsize=8)
+        
+                # Add misleading annotations
+                ax.text(2.0, 7.5, 0, 'Rich countries are happier?', fontsize=12, color='red')
+                ax.text(0.7, 3.0, 0, 'Poor countries = Sad countries', fontsize=12, color='red')
+        
+                buffer = io.BytesIO()
+                fig.savefig(buffer, format='png', dpi=FIGURE_DPI)
+                plt.close(fig)
+                return buffer.getvalue()
+        
+            # Display the poor visualization
+            st.image(cached_image('poor', render_poor_visualization), use_column_width=True)
+    
+        elif section == "Improved Visualization":
+            st.markdown('<div class="sub-header">Improved Visualization Example</div>', unsafe_allow_html=True)
+        
+            st.markdown("""
+            This improved visualization addresses the issues in the poor example by:
+        
+            - Using a clear 2D scatter plot with appropriate dimensions
+            - Choosing distinct colors for different regions
+            - Selectively labeling only key countries to avoid clutter
+            - Providing a clear, concise title and accurate axis labels
+            - Adding thoughtful annotations that provide genuine insights
+            - Using a clean, professional styling
+            """)
+        
+            # Create an improved visualization
+            def render_improved_visualization():
+                fig = plt.figure(figsize=FIGURE_SIZES['improved'])
+        
+                # Set a clean, professional style
+                sns.set_style("whitegrid")
+        
+                # Choose a color palette with good contrast
+                region_colors = {
+                    'Europe': '#1f77b4',
+                    'North America': '#ff7f0e',
+                    'Latin America': '#2ca02c',
+                    'Asia & Pacific': '#d62728',
+                    'Middle East': '#9467bd',
+                    'Africa': '#8c564b',
+                    'Former Soviet States': '#e377c2',
+                    'Other': '#7f7f7f'
+                }
         
-        # Create an improved visualization
-        plt.figure(figsize=(12, 8))
-        
-        # Set a clean, professional style
-        sns.set_style("whitegrid")
-        
-        # Choose a color palette with good contrast
-        region_colors = {
-            'Europe': '#1f77b4',
-            'North America': '#ff7f0e',
-            'Latin America': '#2ca02c',
-            'Asia & Pacific': '#d62728',
-            'Middle East': '#9467bd',
-            'Africa': '#8c564b',
-            'Former Soviet States': '#e377c2',
-            'Other': '#7f7f7f'
-        }
-        
-        # Plot data by region with clear colors
-        for region, color in region_colors.items():
-            region_data = happiness_data[happiness_data['Region'] == region]
-            if len(region_data) > 0:
-                plt.scatter(
-                    region_data['GDP_per_capita'],
-                    region_data['Happiness_score'],
-                    c=color,
-                    s=70,
-                    alpha=0.8,
-                    label=region
+                # Plot data by region with clear colors
+                for region, color in region_colors.items():
+                    region_data = happiness_data[happiness_data['Region'] == region]
+                    if len(region_data) > 0:
+                        plt.scatter(
+                            region_data['GDP_per_capita'],
+                            region_data['Happiness_score'],
+                            c=color,
+                            s=70,
+                            alpha=0.8,
+                            label=region
+                        )
+        
+                # Add regression line to show the trend
+                sns.regplot(
+                    x='GDP_per_capita', 
+                    y='Happiness_score', 
+                    data=happiness_data, 
+                    scatter=False, 
+                    color='black', 
+                    line_kws={"linestyle": "--"},
+                    seed=JITTER_SEED
                 )
         
-        # Add regression line to show the trend
-        sns.regplot(
-            x='GDP_per_capita', 
-            y='Happiness_score', 
-            data=happiness_data, 
-            scatter=False, 
-            color='black', 
-            line_kws={"linestyle": "--"}
-        )
-        
-        # Label only a few key countries to avoid clutter
-        top_countries = happiness_data.nlargest(3, 'Happiness_score')['Country'].tolist()
-        bottom_countries = happiness_data.nsmallest(3, 'Happiness_score')['Country'].tolist()
-        outlier_countries = ['United States', 'China', 'Japan', 'Brazil']
-        countries_to_label = top_countries + bottom_countries + outlier_countries
-        
-        for country in countries_to_label:
-            if country in happiness_data['Country'].values:
-                country_data = happiness_data[happiness_data['Country'] == country].iloc[0]
-                plt.text(
-                    country_data['GDP_per_capita'] + 0.03, 
-                    country_data['Happiness_score'] + 0.05,
-                    country,
-                    fontsize=9,
-                    fontweight='bold' if country in top_countries + bottom_countries else 'normal'
+                # Label only a few key countries to avoid clutter
+                top_countries = happiness_data.nlargest(3, 'Happiness_score')['Country'].tolist()
+                bottom_countries = happiness_data.nsmallest(3, 'Happiness_score')['Country'].tolist()
+                outlier_countries = ['United States', 'China', 'Japan', 'Brazil']
+                countries_to_label = top_countries + bottom_countries + outlier_countries
+        
+                for country in countries_to_label:
+                    if country in happiness_data['Country'].values:
+                        country_data = happiness_data[happiness_data['Country'] == country].iloc[0]
+                        plt.text(
+                            country_data['GDP_per_capita'] + 0.03, 
+                            country_data['Happiness_score'] + 0.05,
+                            country,
+                            fontsize=9,
+                            fontweight='bold' if country in top_countries + bottom_countries else 'normal'
+                        )
+        
+                # Clear, informative title and axis labels
+                plt.title('Relationship Between GDP per Capita and Happiness Score (2022)', fontsize=16)
+                plt.xlabel('GDP per Capita (Contribution to Happiness)', fontsize=12)
+                plt.ylabel('Happiness Score (0-10 scale)', fontsize=12)
+        
+                # Add a clear legend in a non-intrusive position
+                plt.legend(title='Region', title_fontsize=10, fontsize=9, loc='lower right')
+        
+                # Set appropriate axis limits
+                plt.xlim(0.5, 2.3)
+                plt.ylim(2.0, 8.5)
+        
+                # Add meaningful annotations
+                plt.annotate(
+                    'Nordic countries lead in\nboth GDP and happiness', 
+                    xy=(1.95, 7.7), 
+                    xytext=(1.3, 8.2),
+                    arrowprops=dict(facecolor='black', shrink=0.05, width=1, alpha=0.5),
+                    fontsize=10
                 )
         
-        # Clear, informative title and axis labels
-        plt.title('Relationship Between GDP per Capita and Happiness Score (2022)', fontsize=16)
-        plt.xlabel('GDP per Capita (Contribution to Happiness)', fontsize=12)
-        plt.ylabel('Happiness Score (0-10 scale)', fontsize=12)
-        
-        # Add a clear legend in a non-intrusive position
-        plt.legend(title='Region', title_fontsize=10, fontsize=9, loc='lower right')
-        
-        # Set appropriate axis limits
-        plt.xlim(0.5, 2.3)
-        plt.ylim(2.0, 8.5)
-        
-        # Add meaningful annotations
-        plt.annotate(
-            'Nordic countries lead in\nboth GDP and happiness', 
-            xy=(1.95, 7.7), 
-            xytext=(1.3, 8.2),
-            arrowprops=dict(facecolor='black', shrink=0.05, width=1, alpha=0.5),
-            fontsize=10
-        )
+                plt.annotate(
+                    'Latin American countries often have\nhigher happiness scores than their\nGDP would predict', 
+                    xy=(1.4, 6.1), 
+                    xytext=(0.6, 7.0),
+                    arrowprops=dict(facecolor='black', shrink=0.05, width=1, alpha=0.5),
+                    fontsize=10
+                )
         
-        plt.annotate(
-            'Latin American countries often have\nhigher happiness scores than their\nGDP would predict', 
-            xy=(1.4, 6.1), 
-            xytext=(0.6, 7.0),
-            arrowprops=dict(facecolor='black', shrink=0.05, width=1, alpha=0.5),
-            fontsize=10
-        )
+                # Add source information
+                plt.figtext(0.99, 0.01, 'Source: World Happiness Report 2022', ha='right', fontsize=8)
         
-        # Add source information
-        plt.figtext(0.99, 0.01, 'Source: World Happiness Report 2022', ha='right', fontsize=8)
+                buffer = io.BytesIO()
+                plt.tight_layout()
+                fig.savefig(buffer, format='png', dpi=FIGURE_DPI)
+                plt.close(fig)
+                return buffer.getvalue()
         
-        # Display the improved visualization
-        buffer = io.BytesIO()
-        plt.tight_layout()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        st.image(buffer, use_column_width=True)
-        plt.close()
+            # Display the improved visualization
+            st.image(cached_image('improved', render_improved_visualization), use_column_width=True)
     
-    with tab3:
-        st.markdown('<div class="sub-header">Comparison & Analysis</div>', unsafe_allow_html=True)
-        
-        # Side-by-side comparison
-        st.markdown("### Side-by-Side Comparison")
-        
-        # Create side-by-side comparison
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(18, 8))
-        
-        # Poor visualization (left)
-        ax1 = fig.add_subplot(1, 2, 1, projection='3d')
-        
-        # Create a color map with poor contrast
-        region_colors = {
-            'Europe': 'lightblue',
-            'North America': 'lightcyan',
-            'Latin America': 'powderblue', 
-            'Asia & Pacific': 'paleturquoise',
-            'Middle East': 'azure',
-            'Africa': 'aliceblue',
-            'Former Soviet States': 'ghostwhite',
-            'Other': 'whitesmoke'
-        }
-        
-        # Plot points with poor readability
-        for region in region_colors:
-            region_data = happiness_data[happiness_data['Region'] == region]
-            if len(region_data) > 0:
-                ax1.scatter(
-                    region_data['GDP_per_capita'] + np.random.normal(0, 0.05, len(region_data)),
-                    region_data['Happiness_score'],
-                    np.zeros_like(region_data['GDP_per_capita']),
-                    color=region_colors[region],
-                    s=40,
-                    label=region,
-                    alpha=0.7
-                )
+        elif section == "Comparison & Analysis":
+            st.markdown('<div class="sub-header">Comparison & Analysis</div>', unsafe_allow_html=True)
+        
+            # Side-by-side comparison
+            st.markdown("### Side-by-Side Comparison")
+        
+            # Create side-by-side comparison
+            def render_comparison():
+                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=FIGURE_SIZES['comparison'])
+                rng = np.random.default_rng(JITTER_SEED)
+        
+                # Poor visualization (left)
+                ax1 = fig.add_subplot(1, 2, 1, projection='3d')
+        
+                # Create a color map with poor contrast
+                region_colors = {
+                    'Europe': 'lightblue',
+                    'North America': 'lightcyan',
+                    'Latin America': 'powderblue', 
+                    'Asia & Pacific': 'paleturquoise',
+                    'Middle East': 'azure',
+                    'Africa': 'aliceblue',
+                    'Former Soviet States': 'ghostwhite',
+                    'Other': 'whitesmoke'
+                }
         
-        # Confusing title and labels
-        ax1.set_title('POOR VISUALIZATION', fontsize=14)
-        ax1.set_xlabel('GDP contribution (?)', fontsize=8)
-        ax1.set_ylabel('Happiness?', fontsize=8)
-        ax1.view_init(elev=30, azim=45)
-        ax1.grid(True, linestyle='-', linewidth=1.5, alpha=0.7)
-        
-        # Improved visualization (right)
-        plt.subplot(1, 2, 2)
-        
-        # Set a clean style
-        sns.set_style("whitegrid")
-        
-        # Choose a color palette with good contrast
-        region_colors = {
-            'Europe': '#1f77b4',
-            'North America': '#ff7f0e',
-            'Latin America': '#2ca02c',
-            'Asia & Pacific': '#d62728',
-            'Middle East': '#9467bd',
-            'Africa': '#8c564b',
-            'Former Soviet States': '#e377c2',
-            'Other': '#7f7f7f'
-        }
-        
-        # Plot data by region with clear colors
-        for region, color in region_colors.items():
-            region_data = happiness_data[happiness_data['Region'] == region]
-            if len(region_data) > 0:
-                plt.scatter(
-                    region_data['GDP_per_capita'],
-                    region_data['Happiness_score'],
-                    c=color,
-                    s=50,
-                    alpha=0.8,
-                    label=region
+                # Plot points with poor readability
+                for region in region_colors:
+                    region_data = happiness_data[happiness_data['Region'] == region]
+                    if len(region_data) > 0:
+                        ax1.scatter(
+                            region_data['GDP_per_capita'] + rng.normal(0, 0.05, len(region_data)),
+                            region_data['Happiness_score'],
+                            np.zeros_like(region_data['GDP_per_capita']),
+                            color=region_colors[region],
+                            s=40,
+                            label=region,
+                            alpha=0.7
+                        )
+        
+                # Confusing title and labels
+                ax1.set_title('POOR VISUALIZATION', fontsize=14)
+                ax1.set_xlabel('GDP contribution (?)', fontsize=8)
+                ax1.set_ylabel('Happiness?', fontsize=8)
+                ax1.view_init(elev=30, azim=45)
+                ax1.grid(True, linestyle='-', linewidth=1.5, alpha=0.7)
+        
+                # Improved visualization (right)
+                plt.subplot(1, 2, 2)
+        
+                # Set a clean style
+                sns.set_style("whitegrid")
+        
+                # Choose a color palette with good contrast
+                region_colors = {
+                    'Europe': '#1f77b4',
+                    'North America': '#ff7f0e',
+                    'Latin America': '#2ca02c',
+                    'Asia & Pacific': '#d62728',
+                    'Middle East': '#9467bd',
+                    'Africa': '#8c564b',
+                    'Former Soviet States': '#e377c2',
+                    'Other': '#7f7f7f'
+                }
+        
+                # Plot data by region with clear colors
+                for region, color in region_colors.items():
+                    region_data = happiness_data[happiness_data['Region'] == region]
+                    if len(region_data) > 0:
+                        plt.scatter(
+                            region_data['GDP_per_capita'],
+                            region_data['Happiness_score'],
+                            c=color,
+                            s=50,
+                            alpha=0.8,
+                            label=region
+                        )
+        
+                # Add regression line
+                sns.regplot(
+                    x='GDP_per_capita', 
+                    y='Happiness_score', 
+                    data=happiness_data, 
+                    scatter=False, 
+                    color='black', 
+                    line_kws={"linestyle": "--"},
+                    seed=JITTER_SEED
                 )
         
-        # Add regression line
-        sns.regplot(
-            x='GDP_per_capita', 
-            y='Happiness_score', 
-            data=happiness_data, 
-            scatter=False, 
-            color='black', 
-            line_kws={"linestyle": "--"}
-        )
+                # Clear title and labels
+                plt.title('IMPROVED VISUALIZATION', fontsize=14)
+                plt.xlabel('GDP per Capita', fontsize=10)
+                plt.ylabel('Happiness Score (0-10)', fontsize=10)
         
-        # Clear title and labels
-        plt.title('IMPROVED VISUALIZATION', fontsize=14)
-        plt.xlabel('GDP per Capita', fontsize=10)
-        plt.ylabel('Happiness Score (0-10)', fontsize=10)
+                plt.suptitle('Comparison of Poor vs. Improved Data Visualization Techniques', fontsize=16)
         
-        plt.suptitle('Comparison of Poor vs. Improved Data Visualization Techniques', fontsize=16)
+                buffer = io.BytesIO()
+                plt.tight_layout(rect=[0, 0, 1, 0.95])
+                fig.savefig(buffer, format='png', dpi=FIGURE_DPI)
+                plt.close(fig)
+                return buffer.getvalue()
         
-        # Display the comparison
-        buffer = io.BytesIO()
-        plt.tight_layout(rect=[0, 0, 1, 0.95])
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        st.image(buffer, use_column_width=True)
-        plt.close()
+            # Display the comparison
+            st.image(cached_image('comparison', render_comparison), use_column_width=True)
         
-        # Analysis of the visualizations
-        st.markdown("### Analysis of Visualization Techniques")
+            # Analysis of the visualizations
+            st.markdown("### Analysis of Visualization Techniques")
         
-        st.markdown("""
-        #### Issues with the Poor Visualization:
+            st.markdown("""
+            #### Issues with the Poor Visualization:
         
-        1. **Unnecessary Complexity**: The 3D plot adds a dimension that contains no data, making the visualization harder to interpret without adding any value.
+            1. **Unnecessary Complexity**: The 3D plot adds a dimension that contains no data, making the visualization harder to interpret without adding any value.
         
-        2. **Poor Color Choices**: The similar color scheme makes it difficult to distinguish between different regions, reducing the effectiveness of the color coding.
+            2. **Poor Color Choices**: The similar color scheme makes it difficult to distinguish between different regions, reducing the effectiveness of the color coding.
         
-        3. **Visual Clutter**: Labeling every country creates overwhelming visual noise that obscures the underlying patterns in the data.
+            3. **Visual Clutter**: Labeling every country creates overwhelming visual noise that obscures the underlying patterns in the data.
         
-        4. **Misleading Elements**: The confusing title, unclear axis labels, and questionable annotations can lead viewers to incorrect conclusions.
+            4. **Misleading Elements**: The confusing title, unclear axis labels, and questionable annotations can lead viewers to incorrect conclusions.
         
-        5. **Distracting Features**: Heavy grid lines and an awkward viewing angle draw attention away from the data itself.
+            5. **Distracting Features**: Heavy grid lines and an awkward viewing angle draw attention away from the data itself.
         
-        #### Improvements in the Better Visualization:
+            #### Improvements in the Better Visualization:
         
-        1. **Appropriate Dimensions**: Using a 2D scatter plot allows for clear visualization of the relationship between GDP and happiness.
+            1. **Appropriate Dimensions**: Using a 2D scatter plot allows for clear visualization of the relationship between GDP and happiness.
         
-        2. **Effective Color Coding**: Distinct colors for each region make it easy to identify regional patterns in the data.
+            2. **Effective Color Coding**: Distinct colors for each region make it easy to identify regional patterns in the data.
         
-        3. **Selective Labeling**: Highlighting only key countries (highest, lowest, and notable outliers) reduces clutter while still providing context.
+            3. **Selective Labeling**: Highlighting only key countries (highest, lowest, and notable outliers) reduces clutter while still providing context.
         
-        4. **Clear Communication**: Concise, informative title and accurate axis labels help viewers understand exactly what they're looking at.
+            4. **Clear Communication**: Concise, informative title and accurate axis labels help viewers understand exactly what they're looking at.
         
-        5. **Meaningful Annotations**: Thoughtful annotations highlight genuine insights rather than suggesting misleading conclusions.
+            5. **Meaningful Annotations**: Thoughtful annotations highlight genuine insights rather than suggesting misleading conclusions.
         
-        6. **Professional Styling**: Clean design with appropriate grid lines and a regression line to show the overall trend.
-        """)
+            6. **Professional Styling**: Clean design with appropriate grid lines and a regression line to show the overall trend.
+            """)
         
-        # Add statistical insights
-        st.markdown("### Statistical Insights")
+            # Add statistical insights
+            st.markdown("### Statistical Insights")
         
-        # Calculate correlation
-        correlation = happiness_data['GDP_per_capita'].corr(happiness_data['Happiness_score'])
+            # Calculate correlation
+            correlation = happiness_data['GDP_per_capita'].corr(happiness_data['Happiness_score'])
         
-        # Calculate linear regression
-        X = happiness_data[['GDP_per_capita']]
-        y = happiness_data['Happiness_score']
-        model = LinearRegression().fit(X, y)
-        happiness_data['Predicted_happiness'] = model.predict(X)
-        happiness_data['Happiness_difference'] = happiness_data['Happiness_score'] - happiness_data['Predicted_happiness']
+            # Calculate linear regression
+            X = happiness_data[['GDP_per_capita']]
+            y = happiness_data['Happiness_score']
+            model = LinearRegression().fit(X, y)
+            happiness_data['Predicted_happiness'] = model.predict(X)
+            happiness_data['Happiness_difference'] = happiness_data['Happiness_score'] - happiness_data['Predicted_happiness']
         
-        # Group by region and calculate average difference
-        region_diff = happiness_data.groupby('Region')['Happiness_difference'].mean().sort_values(ascending=False)
+            # Group by region and calculate average difference
+            region_diff = happiness_data.groupby('Region')['Happiness_difference'].mean().sort_values(ascending=False)
         
-        col1, col2 = st.columns(2)
+            col1, col2 = st.columns(2)
         
-        with col1:
-            st.metric("Correlation between GDP and Happiness", f"{correlation:.2f}")
-            st.write("This strong positive correlation indicates that countries with higher GDP per capita tend to report higher levels of happiness.")
+            with col1:
+                st.metric("Correlation between GDP and Happiness", f"{correlation:.2f}")
+                st.write("This strong positive correlation indicates that countries with higher GDP per capita tend to report higher levels of happiness.")
         
-        with col2:
-            st.metric("R² (Coefficient of Determination)", f"{model.score(X, y):.2f}")
-            st.write("This means that approximately this percentage of the variation in happiness scores can be explained by GDP per capita.")
+            with col2:
+                st.metric("R² (Coefficient of Determination)", f"{model.score(X, y):.2f}")
+                st.write("This means that approximately this percentage of the variation in happiness scores can be explained by GDP per capita.")
         
-        st.subheader("Regions Where Countries are Happier Than GDP Would Predict")
+            st.subheader("Regions Where Countries are Happier Than GDP Would Predict")
         
-        # Create a horizontal bar chart for regional happiness differences
-        fig = plt.figure(figsize=(10, 6))
-        plt.barh(region_diff.index, region_diff.values)
-        plt.axvline(x=0, color='black', linestyle='-', alpha=0.3)
-        plt.xlabel('Average Happiness Difference from GDP Prediction')
-        plt.title('Regions Where Happiness Exceeds or Falls Short of GDP-Based Predictions')
+            # Create a horizontal bar chart for regional happiness differences
+            def render_region_differences():
+                fig = plt.figure(figsize=FIGURE_SIZES['region_differences'])
+                plt.barh(region_diff.index, region_diff.values)
+                plt.axvline(x=0, color='black', linestyle='-', alpha=0.3)
+                plt.xlabel('Average Happiness Difference from GDP Prediction')
+                plt.title('Regions Where Happiness Exceeds or Falls Short of GDP-Based Predictions')
         
-        # Add value labels
-        for i, v in enumerate(region_diff.values):
-            plt.text(v + 0.05 if v >= 0 else v - 0.3, i, f"{v:.2f}", va='center')
+                # Add value labels
+                for i, v in enumerate(region_diff.values):
+                    plt.text(v + 0.05 if v >= 0 else v - 0.3, i, f"{v:.2f}", va='center')
         
-        # Display the bar chart
-        buffer = io.BytesIO()
-        plt.tight_layout()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        st.image(buffer, use_column_width=True)
-        plt.close()
+                buffer = io.BytesIO()
+                plt.tight_layout()
+                fig.savefig(buffer, format='png', dpi=FIGURE_DPI)
+                plt.close(fig)
+                return buffer.getvalue()
         
-        st.markdown("""
-        The chart above shows which regions have happiness levels that exceed or fall short of what would be predicted based on GDP alone. 
-        Latin American countries, for example, tend to report higher happiness levels than their economic indicators would suggest, 
-        which is often referred to as the "Latin American paradox" in happiness research.
-        """)
+            # Display the bar chart
+            st.image(cached_image('region_differences', render_region_differences), use_column_width=True)
+        
+            st.markdown("""
+            The chart above shows which regions have happiness levels that exceed or fall short of what would be predicted based on GDP alone. 
+            Latin American countries, for example, tend to report higher happiness levels than their economic indicators would suggest, 
+            which is often referred to as the "Latin American paradox" in happiness research.
+            """)
     
-    with tab4:
-        st.markdown('<div class="sub-header">Conclusion</div>', unsafe_allow_html=True)
+        elif section == "Conclusion":
+            st.markdown('<div class="sub-header">Conclusion</div>', unsafe_allow_html=True)
         
-        st.markdown("""
-        ## Conclusion: Comparing the Poor and Improved Visualizations
+            st.markdown("""
+            ## Conclusion: Comparing the Poor and Improved Visualizations
         
-        When we examine the two visualizations of the World Happiness Report data, we can see stark differences in how effectively they communicate insights about the relationship between GDP per capita and happiness scores.
+            When we examine the two visualizations of the World Happiness Report data, we can see stark differences in how effectively they communicate insights about the relationship between GDP per capita and happiness scores.
         
-        The poor visualization fails the audience in multiple fundamental ways. By using an unnecessary 3D perspective for inherently 2D data, it creates a distorted view that makes accurate comparison between points nearly impossible. The similar color shades across different regions make it difficult to distinguish between regional patterns, which obscures one of the most interesting aspects of the data. Furthermore, the cluttered approach of labeling every single country creates visual noise that overwhelms the viewer, making it nearly impossible to extract meaningful patterns. The misleading annotations ("Poor countries = Sad countries") impose a biased interpretation rather than allowing the data to speak for itself.
+            The poor visualization fails the audience in multiple fundamental ways. By using an unnecessary 3D perspective for inherently 2D data, it creates a distorted view that makes accurate comparison between points nearly impossible. The similar color shades across different regions make it difficult to distinguish between regional patterns, which obscures one of the most interesting aspects of the data. Furthermore, the cluttered approach of labeling every single country creates visual noise that overwhelms the viewer, making it nearly impossible to extract meaningful patterns. The misleading annotations ("Poor countries = Sad countries") impose a biased interpretation rather than allowing the data to speak for itself.
         
-        In contrast, the improved visualization embodies several key principles of effective data communication. By using a clear 2D representation, it allows viewers to accurately assess the relationship between GDP and happiness without distortion. The distinct color scheme for different regions enables immediate recognition of regional patterns – we can clearly see how European countries cluster at the top-right, while African nations tend toward the bottom-left. By selectively labeling only key countries (highest, lowest, and notable outliers), it maintains context without overwhelming the viewer with text. The regression line provides an immediate visual representation of the overall relationship, allowing viewers to identify countries that deviate from the expected pattern. The thoughtful annotations highlight genuine insights rather than imposing simplistic conclusions.
+            In contrast, the improved visualization embodies several key principles of effective data communication. By using a clear 2D representation, it allows viewers to accurately assess the relationship between GDP and happiness without distortion. The distinct color scheme for different regions enables immediate recognition of regional patterns – we can clearly see how European countries cluster at the top-right, while African nations tend toward the bottom-left. By selectively labeling only key countries (highest, lowest, and notable outliers), it maintains context without overwhelming the viewer with text. The regression line provides an immediate visual representation of the overall relationship, allowing viewers to identify countries that deviate from the expected pattern. The thoughtful annotations highlight genuine insights rather than imposing simplistic conclusions.
         
-        What makes this comparison particularly instructive is that both visualizations use exactly the same underlying data. The dramatic difference in clarity and insight demonstrates how visualization choices can either reveal or conceal the story within the data. The poor visualization might lead viewers to conclude only that "rich countries are happier," while missing nuanced patterns like how Latin American countries consistently achieve higher happiness scores than their economic metrics would predict, or how certain regions show greater variability in happiness despite similar economic conditions.
+            What makes this comparison particularly instructive is that both visualizations use exactly the same underlying data. The dramatic difference in clarity and insight demonstrates how visualization choices can either reveal or conceal the story within the data. The poor visualization might lead viewers to conclude only that "rich countries are happier," while missing nuanced patterns like how Latin American countries consistently achieve higher happiness scores than their economic metrics would predict, or how certain regions show greater variability in happiness despite similar economic conditions.
         
-        This comparison serves as a powerful reminder that data visualization is not merely a technical exercise but a form of communication that requires thoughtful design choices. The most effective visualizations strip away unnecessary complexity, highlight meaningful patterns, provide appropriate context, and ultimately respect both the data and the viewer's intelligence.
-        """)
+            This comparison serves as a powerful reminder that data visualization is not merely a technical exercise but a form of communication that requires thoughtful design choices. The most effective visualizations strip away unnecessary complexity, highlight meaningful patterns, provide appropriate context, and ultimately respect both the data and the viewer's intelligence.
+            """)
+
+    problem3_sections()
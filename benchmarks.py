@@ -0,0 +1,321 @@
+import argparse
+import subprocess
+import sys
+import time
+
+from page_registry import PAGES
+
+# Each page is measured in a fresh interpreter so every run is a true cold start.
+# streamlit is imported first because the app always has it loaded before a page runs.
+IMPORT_PROBE = """
+import streamlit
+from page_registry import load_page_modules
+print(load_page_modules({page!r}))
+"""
+
+
+def bench_page_imports(repeat):
+    over_budget = []
+    print(f"{'Page':<45}{'Cold import (s)':>18}{'Budget (s)':>12}")
+    for page, spec in PAGES.items():
+        timings = []
+        for _ in range(repeat):
+            result = subprocess.run(
+                [sys.executable, "-c", IMPORT_PROBE.format(page=page)],
+                capture_output=True, text=True, check=True
+            )
+            timings.append(float(result.stdout.strip().splitlines()[-1]))
+        best = min(timings)
+        print(f"{page:<45}{best:>18.3f}{spec['budget']:>12.2f}")
+        if best > spec["budget"]:
+            over_budget.append(page)
+    return over_budget
+
+
+# The original per-flight dict loop, kept as the baseline for the vectorized generator
+def legacy_generate_airport_data(airport_code, n_flights):
+    import numpy as np
+    import pandas as pd
+    from airport_data import AIRLINES, DESTINATIONS, airport_rng, destination_flight_counts
+
+    counts, distance = destination_flight_counts(airport_code, airport_rng(airport_code), n_flights)
+    flights = []
+    for (dest_code, dest_info), num_flights, dest_distance in zip(DESTINATIONS.items(), counts, distance):
+        for _ in range(num_flights):
+            if dest_info["domestic"]:
+                airline_idx = np.random.randint(0, 5)
+            else:
+                airline_idx = np.random.randint(0, len(AIRLINES))
+            flight_hour = np.random.randint(0, 24)
+            flights.append({
+                "source_airport": airport_code,
+                "destination_airport": dest_code,
+                "destination_name": dest_info["name"],
+                "destination_lat": dest_info["lat"],
+                "destination_lon": dest_info["lon"],
+                "airline": AIRLINES[airline_idx],
+                "flight_hour": flight_hour,
+                "domestic": dest_info["domestic"],
+                "region": dest_info["region"],
+                "distance": dest_distance
+            })
+    return pd.DataFrame(flights)
+
+
+def bench_flight_generator(sizes, legacy_max):
+    from airport_data import generate_airport_data
+
+    print(f"{'Flights':>10}{'Loop (s)':>12}{'Vectorized (s)':>16}{'Speedup':>10}"
+          f"{'Loop MB':>10}{'Star MB':>10}{'Reduction':>11}")
+    for n_flights in sizes:
+        start = time.perf_counter()
+        _, destinations, flights = generate_airport_data("JFK", n_flights)
+        vectorized_s = time.perf_counter() - start
+        # Shallow sizes: the loop's strings are shared references, so deep sizes would overcount them
+        star_mb = (flights.memory_usage().sum() + destinations.memory_usage().sum()) / 1e6
+
+        if n_flights <= legacy_max:
+            start = time.perf_counter()
+            legacy = legacy_generate_airport_data("JFK", n_flights)
+            legacy_s = time.perf_counter() - start
+            assert len(legacy) == len(flights)
+            legacy_mb = legacy.memory_usage().sum() / 1e6
+            print(f"{n_flights:>10.0e}{legacy_s:>12.3f}{vectorized_s:>16.3f}{legacy_s / vectorized_s:>9.0f}x"
+                  f"{legacy_mb:>10.1f}{star_mb:>10.1f}{legacy_mb / star_mb:>10.0f}x")
+        else:
+            print(f"{n_flights:>10.0e}{'skipped':>12}{vectorized_s:>16.3f}{'':>10}{'':>10}{star_mb:>10.1f}")
+
+
+# Random network with a heavy-tailed hub structure, sized like the global OpenFlights network
+def bench_route_graph(n_airports, n_routes, n_sources):
+    import numpy as np
+    from route_graph import build_route_graph, connecting_hubs, hub_ranking, reachability_levels
+
+    rng = np.random.default_rng(0)
+    codes = np.array([f"A{i:04d}" for i in range(n_airports)], dtype=object)
+    weights = 1 / np.arange(1, n_airports + 1) ** 0.9
+    weights /= weights.sum()
+    sources = codes[rng.choice(n_airports, n_routes, p=weights)]
+    destinations = codes[rng.choice(n_airports, n_routes, p=weights)]
+
+    start = time.perf_counter()
+    graph = build_route_graph(sources, destinations)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ranking = hub_ranking(graph)
+    ranking_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for airport_code in ranking["Airport"].head(n_sources):
+        connecting_hubs(graph, reachability_levels(graph, airport_code))
+    per_source_s = (time.perf_counter() - start) / n_sources
+
+    print(f"{n_airports:,} airports, {n_routes:,} routes")
+    print(f"{'Build CSR graph (s)':<40}{build_s:>10.4f}")
+    print(f"{'Network hub ranking (s)':<40}{ranking_s:>10.4f}")
+    print(f"{'BFS + hubs per source, busiest (s)':<40}{per_source_s:>10.4f}")
+
+
+# Radius and nearest-alternate queries on a random global airport index, per query as on a slider change
+def bench_airport_index(n_airports, n_queries):
+    import numpy as np
+    from airport_geo import airports_within, build_airport_index, nearest_alternates
+
+    rng = np.random.default_rng(0)
+    codes = np.array([f"A{i:04d}" for i in range(n_airports)], dtype=object)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n_airports)))
+    lon = rng.uniform(-180, 180, n_airports)
+
+    start = time.perf_counter()
+    index = build_airport_index(codes, lat, lon)
+    build_s = time.perf_counter() - start
+
+    print(f"{n_airports:,} airports, {n_queries:,} queries each")
+    print(f"{'Build ball tree (s)':<40}{build_s:>10.4f}")
+    queries = rng.integers(0, n_airports, n_queries)
+    for radius_nm in (250, 1000, 2500):
+        start = time.perf_counter()
+        for query in queries:
+            airports_within(index, lat[query], lon[query], radius_nm)
+        per_query_ms = (time.perf_counter() - start) / n_queries * 1000
+        print(f"{f'Airports within {radius_nm:,} nm (ms)':<40}{per_query_ms:>10.4f}")
+
+    start = time.perf_counter()
+    for query in queries:
+        nearest_alternates(index, codes[query:query + 1])
+    per_query_ms = (time.perf_counter() - start) / n_queries * 1000
+    print(f"{'Nearest alternate, one airport (ms)':<40}{per_query_ms:>10.4f}")
+
+
+# Streaming aggregation of the local on-time files: time and peak resident memory after each file
+def bench_ontime_pipeline():
+    import resource
+    from ontime import combine_ontime_summaries, ontime_files, summarize_ontime_file
+
+    paths = ontime_files()
+    if not paths:
+        print("No on-time files found")
+        return
+    summary = None
+    print(f"{'File':<40}{'Time (s)':>10}{'Peak RSS (MB)':>16}")
+    for path in paths:
+        start = time.perf_counter()
+        file_summary = summarize_ontime_file(path)
+        summary = file_summary if summary is None else combine_ontime_summaries([summary, file_summary])
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"{path:<40}{time.perf_counter() - start:>10.2f}{peak_mb:>16.1f}")
+
+
+# Per-term aggregation of synthetic student-level records with every installed query backend
+def bench_student_backends(n_rows, repeat):
+    import os
+    import tempfile
+    from student_store import BACKENDS, available_backends, generate_student_records, write_student_records
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "students.parquet")
+        write_student_records(generate_student_records(n_rows), path)
+        print(f"{n_rows:,} student records ({os.path.getsize(path) / 1e6:.1f} MB Parquet)")
+        print(f"{'Backend':<12}{'Term summary (s)':>18}")
+        expected = None
+        for backend in available_backends():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                summary = BACKENDS[backend](path)
+                timings.append(time.perf_counter() - start)
+            if expected is None:
+                expected = summary
+            elif not summary.equals(expected):
+                print(f"{backend} result differs from {available_backends()[0]}")
+            print(f"{backend:<12}{min(timings):>18.3f}")
+
+
+def bench_cohort_retention(n_students, repeat):
+    from student_store import cohort_retention, generate_enrollment_records
+
+    records = generate_enrollment_records(n_students)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cohorts = cohort_retention(records)
+        timings.append(time.perf_counter() - start)
+    print(f"{len(records):,} student-term records, {n_students:,} students, {len(cohorts)} cohorts")
+    print(f"{'Cohort retention matrix (s)':<40}{min(timings):>10.3f}")
+
+
+def bench_forecast(n_series, repeat):
+    import numpy as np
+    import pandas as pd
+    from forecast import forecast_next_terms
+
+    rng = np.random.default_rng(0)
+    years = np.repeat(np.arange(2015, 2025), 2)
+    trend = (years - years.min())[:, None] * rng.uniform(-20, 20, n_series)
+    data = pd.DataFrame(rng.normal(1000, 50, (len(years), n_series)) + trend,
+                        columns=[f"Program {i} Enrolled" for i in range(n_series)])
+    data.insert(0, "Term", np.tile(["Spring", "Fall"], len(years) // 2))
+    data.insert(0, "Year", years)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        forecast_next_terms(data)
+        timings.append(time.perf_counter() - start)
+    print(f"{n_series:,} series x {len(data)} terms")
+    print(f"{'Forecast all series (ms)':<40}{min(timings) * 1000:>10.2f}")
+
+
+# Admissions-funnel scenarios drawn once, then one slider move: the re-simulation alone and with its summary
+def bench_funnel(repeat):
+    from funnel import FUNNEL_SCENARIOS, draw_funnel_scenarios, funnel_summary, simulate_funnel
+    from university_data import read_university_data
+
+    data = read_university_data()
+    start = time.perf_counter()
+    scenarios = draw_funnel_scenarios(data)
+    draw_s = time.perf_counter() - start
+
+    print(f"{FUNNEL_SCENARIOS:,} scenarios x {len(scenarios['terms'])} terms")
+    print(f"{'Draw scenarios (s)':<40}{draw_s:>10.3f}")
+    for label, step in (("Simulate one slider setting (ms)", simulate_funnel), ("Simulate and summarize (ms)", funnel_summary)):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            step(scenarios, 0.6, 1.1)
+            timings.append(time.perf_counter() - start)
+        print(f"{label:<40}{min(timings) * 1000:>10.1f}")
+
+
+# JSON size of the trend chart data after downsampling, from a few series to many department series.
+# Returns the cases whose payload is over the chart byte budget.
+def bench_trend_payload(n_rows):
+    import numpy as np
+    import pandas as pd
+    import plotly.graph_objects as go
+    from plotly.io.json import to_json_plotly
+    from downsample import CHART_BYTE_BUDGET, downsample_trends, trend_trace
+
+    rng = np.random.default_rng(0)
+    labels = [f"{2000 + row // 2}-{('Spring', 'Fall')[row % 2]}" for row in range(n_rows)]
+    over_budget = []
+    print(f"{'Series':>8}{'Rows kept':>12}{'Payload (KB)':>15}{'Budget (KB)':>13}{'Downsample (ms)':>17}")
+    for n_series in (3, 30, 120, 500, 1000):
+        columns = [f"Department {i} Enrolled" for i in range(n_series)]
+        frame = pd.DataFrame(rng.normal(1000, 50, (n_rows, n_series)).cumsum(axis=0), columns=columns)
+        frame.insert(0, "Year-Term", labels)
+
+        start = time.perf_counter()
+        trend = downsample_trends(frame, columns)
+        downsample_ms = (time.perf_counter() - start) * 1000
+        fig = go.Figure([trend_trace(trend["Year-Term"], trend[column], column) for column in columns])
+        payload = len(to_json_plotly(fig.to_dict()["data"]))
+        print(f"{n_series:>8,}{len(trend):>12,}{payload / 1000:>15.1f}{CHART_BYTE_BUDGET / 1000:>13.1f}{downsample_ms:>17.1f}")
+        if payload > CHART_BYTE_BUDGET:
+            over_budget.append(f"{n_series} series")
+    return over_budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Performance benchmarks for the dashboard")
+    parser.add_argument("benchmark", choices=["imports", "flights", "graph", "geo", "ontime", "students", "forecast", "cohorts", "funnel", "trends"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--legacy-max", type=float, default=1e6,
+                        help="largest flight count to run through the per-flight loop baseline")
+    parser.add_argument("--rows", type=int, default=10_000_000,
+                        help="number of student records for the students benchmark")
+    parser.add_argument("--series", type=int, default=5000,
+                        help="number of series for the forecast benchmark")
+    args = parser.parse_args()
+
+    if args.benchmark == "imports":
+        over_budget = bench_page_imports(args.repeat)
+        if over_budget:
+            print("Over budget: " + ", ".join(over_budget))
+            sys.exit(1)
+    elif args.benchmark == "flights":
+        bench_flight_generator([10 ** exponent for exponent in range(3, 8)], args.legacy_max)
+    elif args.benchmark == "graph":
+        bench_route_graph(3000, 60000, 50)
+    elif args.benchmark == "geo":
+        bench_airport_index(10000, 1000)
+    elif args.benchmark == "ontime":
+        bench_ontime_pipeline()
+    elif args.benchmark == "students":
+        bench_student_backends(args.rows, args.repeat)
+    elif args.benchmark == "forecast":
+        bench_forecast(args.series, args.repeat)
+    elif args.benchmark == "cohorts":
+        bench_cohort_retention(200_000, args.repeat)
+    elif args.benchmark == "funnel":
+        bench_funnel(args.repeat)
+    elif args.benchmark == "trends":
+        over_budget = bench_trend_payload(20_000)
+        if over_budget:
+            print("Over budget: " + ", ".join(over_budget))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import numpy as np
+import plotly.graph_objects as go
+
+# Byte budget for the data of one trend chart, and conservative JSON sizes of one (x, y) pair in it (a
+# Year-Term label and a full-precision float) and of the rest of one trace (type, mode and name)
+CHART_BYTE_BUDGET = 250_000
+BYTES_PER_POINT = 40
+BYTES_PER_TRACE = 128
+
+# Above this many points a trace is drawn with WebGL and without markers
+WEBGL_POINT_THRESHOLD = 1_000
+
+
+# Largest-triangle-three-buckets: indices of n_out points that keep the visual shape of the series.
+# The first and last points are kept; every bucket in between contributes the point that forms the
+# largest triangle with the previously kept point and the average of the next bucket, so peaks survive.
+def lttb_indices(y, n_out, x=None):
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x, next_y = x[stop:next_stop].mean(), np.nanmean(y[stop:next_stop])
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[bucket + 1] = previous
+    return selected
+
+
+# Rows of a trend table to plot within the byte budget: at most max_points rows, whatever the number of columns.
+# Every column gets an equal share of the rows; the rows LTTB keeps for any column are kept for all, so traces
+# share one x axis and each keeps its peaks. With fewer than three rows per column LTTB cannot run, so the
+# rows are then spaced evenly instead.
+def downsample_trends(frame, y_columns, byte_budget=CHART_BYTE_BUDGET):
+    if not y_columns:
+        return frame
+    max_points = max(byte_budget - BYTES_PER_TRACE * len(y_columns), 0) // (BYTES_PER_POINT * len(y_columns))
+    if len(frame) <= max_points:
+        return frame
+    per_column = max_points // len(y_columns)
+    if per_column >= 3:
+        rows = np.unique(np.concatenate([lttb_indices(frame[column].to_numpy(), per_column) for column in y_columns]))
+    else:
+        rows = np.linspace(0, len(frame) - 1, max_points).round().astype(np.intp)
+    return frame.iloc[rows]
+
+
+# Line trace for a trend chart: SVG with markers for short series, WebGL lines for long ones
+def trend_trace(x, y, name):
+    if len(x) > WEBGL_POINT_THRESHOLD:
+        return go.Scattergl(x=x, y=y, mode='lines', name=name)
+    return go.Scatter(x=x, y=y, mode='lines+markers', name=name)
@@ -0,0 +1,108 @@
+import hashlib
+import marshal
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Figures kept per process; a figure of the per-term tables is a few kilobytes
+FIGURE_CACHE_SIZE = 256
+
+# Rendered PNG images kept in memory (a few hundred kilobytes each), and on disk. The disk tier is off unless
+# the IMAGE_CACHE_DIR environment variable names its directory, and keeps the most recently used images there.
+IMAGE_CACHE_SIZE = 32
+IMAGE_CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR") or None
+IMAGE_CACHE_DISK_ENTRIES = 256
+
+
+# Least-recently-used cache of built figures. Keys identify the dataset version, the filter state and
+# the chart, so a figure is only rebuilt when one of those changes. Cached figures are shared between
+# sessions and must not be modified after they are built.
+class FigureCache:
+    def __init__(self, max_entries=FIGURE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.figures = OrderedDict()
+        self.lock = threading.Lock()
+
+    # The cached figure for key, built with build() on a miss
+    def get(self, key, build):
+        with self.lock:
+            if key in self.figures:
+                self.figures.move_to_end(key)
+                return self.figures[key]
+
+        figure = build()
+        with self.lock:
+            self.figures[key] = figure
+            self.figures.move_to_end(key)
+            while len(self.figures) > self.max_entries:
+                self.figures.popitem(last=False)
+        return figure
+
+
+# Content hash of a DataFrame (values and index), for keys of images rendered from it
+def frame_digest(frame):
+    return hashlib.sha256(pd.util.hash_pandas_object(frame).to_numpy().tobytes()).hexdigest()
+
+
+# Hash of a function's compiled code, for keys of images it renders: editing the plotting code changes the
+# key, so images rendered by the old code are never served again
+def code_digest(function):
+    return hashlib.sha256(marshal.dumps(function.__code__)).hexdigest()
+
+
+# Rendered images (PNG bytes) by key, in the in-memory LRU and, when directory is set, in one file per key
+# on disk, so a restarted server serves them without rendering again. Keys must identify everything the
+# image depends on (data hash, render code, figure id, random seed, dpi and size); render() must be
+# deterministic for them. Files are evicted least recently used first (by mtime, which a hit refreshes)
+# beyond max_disk_entries, so images left behind by old code or library versions are eventually removed.
+class ImageCache(FigureCache):
+    def __init__(self, max_entries=IMAGE_CACHE_SIZE, directory=None, max_disk_entries=IMAGE_CACHE_DISK_ENTRIES):
+        super().__init__(max_entries)
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(repr(key).encode()).hexdigest() + ".png")
+
+    # Disk tier: read the image if it was rendered before, otherwise render it and write it atomically
+    def _load_or_render(self, key, render):
+        if self.directory is None:
+            return render()
+        path = self._path(key)
+        try:
+            with open(path, "rb") as image_file:
+                image = image_file.read()
+            os.utime(path)
+            return image
+        except FileNotFoundError:
+            pass
+        image = render()
+        os.makedirs(self.directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as image_file:
+            image_file.write(image)
+        os.replace(image_file.name, path)
+        self._evict_files()
+        return image
+
+    # Remove the least recently used image files beyond max_disk_entries
+    def _evict_files(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                try:
+                    files.append((entry.stat().st_mtime_ns, entry.path))
+                except FileNotFoundError:
+                    pass
+        files.sort()
+        for _, path in files[:max(len(files) - self.max_disk_entries, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    # The cached image for key, rendered with render() only when neither tier has it
+    def get(self, key, render):
+        return super().get(key, lambda: self._load_or_render(key, render))
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from scipy.special import stdtrit
+
+# Coverage of the prediction intervals
+FORECAST_LEVEL = 0.9
+
+
+# Numeric series of a per-term table that get a forecast: every column except Year and Term
+def forecast_columns(data):
+    return [column for column in data.select_dtypes("number").columns if column != "Year"]
+
+
+# Design matrix of a linear trend per term: an intercept and a slope column for every term, nonzero only
+# on that term's rows. It is block diagonal, so one least-squares solve fits every term separately.
+def _trend_design(term_codes, t, n_terms):
+    design = np.zeros((len(t), 2 * n_terms))
+    rows = np.arange(len(t))
+    design[rows, 2 * term_codes] = 1.0
+    design[rows, 2 * term_codes + 1] = t
+    return design
+
+
+# Next-year forecast of every series for every term, with a prediction interval at the given level.
+# All series and terms are fitted in a single np.linalg.lstsq call on the stacked design matrix, with the
+# series as columns of the right-hand side, so the cost grows with the data and not with a Python loop over
+# series. Intervals use the residual variance of each (term, series) fit and a Student-t quantile with
+# n - 2 degrees of freedom, n being the term's number of years. Std Error and Degrees of Freedom describe
+# the predictive t distribution, for simulations that draw from it.
+def forecast_next_terms(data, columns=None, level=FORECAST_LEVEL):
+    columns = forecast_columns(data) if columns is None else list(columns)
+    data = data.dropna(subset=columns)
+    term_codes, terms = pd.factorize(data["Term"], sort=True)
+    years = data["Year"].to_numpy()
+    first_year = years.min()
+    t = (years - first_year).astype(np.float64)
+    values = data[columns].to_numpy(dtype=np.float64)
+
+    design = _trend_design(term_codes, t, len(terms))
+    coefficients, _, _, _ = np.linalg.lstsq(design, values, rcond=None)
+
+    # Residual variance per (term, series); a term needs three years for its trend to have any residual freedom
+    residuals = values - design @ coefficients
+    term_rows = np.bincount(term_codes, minlength=len(terms))
+    one_hot = np.eye(len(terms))[term_codes]
+    degrees_of_freedom = np.where(term_rows > 2, term_rows - 2, np.nan)
+    variance = (one_hot.T @ residuals ** 2) / degrees_of_freedom[:, None]
+
+    # The year after each term's last observation, and the variance of a new observation there
+    next_years = pd.Series(years).groupby(term_codes).max().to_numpy() + 1
+    next_design = _trend_design(np.arange(len(terms)), (next_years - first_year).astype(np.float64), len(terms))
+    leverage = np.einsum("ij,jk,ik->i", next_design, np.linalg.pinv(design.T @ design), next_design)
+    forecast = next_design @ coefficients
+    std_error = np.sqrt(variance * (1 + leverage[:, None]))
+    margin = stdtrit(degrees_of_freedom, 0.5 + level / 2)[:, None] * std_error
+
+    # Counts and percentages are never negative
+    return pd.DataFrame({
+        "Year": np.repeat(next_years, len(columns)),
+        "Term": np.repeat(np.asarray(terms), len(columns)),
+        "Metric": np.tile(columns, len(terms)),
+        "Forecast": np.maximum(forecast, 0).ravel(),
+        "Lower": np.maximum(forecast - margin, 0).ravel(),
+        "Upper": np.maximum(forecast + margin, 0).ravel(),
+        "Std Error": std_error.ravel(),
+        "Degrees of Freedom": np.repeat(degrees_of_freedom, len(columns))
+    }).sort_values(["Year", "Term"], kind="stable", ignore_index=True)
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+from forecast import forecast_next_terms
+from university_data import melt_departments
+
+# Scenarios drawn per dataset version
+FUNNEL_SCENARIOS = 1_000_000
+
+# Upper bound on the Beta concentration (alpha + beta) fitted to a rate that barely varies between years
+MAX_CONCENTRATION = 10_000
+
+
+# Method-of-moments Beta parameters of yearly rates, one column per term
+def _beta_parameters(rates):
+    mean = rates.mean()
+    variance = rates.var().fillna(0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        concentration = (mean * (1 - mean) / variance - 1).replace([np.inf, -np.inf], np.nan)
+    concentration = concentration.fillna(MAX_CONCENTRATION).clip(2, MAX_CONCENTRATION)
+    return (mean * concentration).to_numpy(), ((1 - mean) * concentration).to_numpy()
+
+
+# Historical funnel of every term: mean admit, yield (enrolled per admitted) and retention rates, and the
+# peak enrollment of a term, which the simulator's capacity is relative to
+def funnel_history(data):
+    rates = pd.DataFrame({
+        "Term": data["Term"],
+        "Admit Rate": data["Admitted"] / data["Applications"],
+        "Yield": data["Enrolled"] / data["Admitted"],
+        "Retention": data["Retention Rate (%)"] / 100,
+        "Peak Enrolled": data["Enrolled"]
+    })
+    return rates.groupby("Term", sort=True).agg({
+        "Admit Rate": "mean", "Yield": "mean", "Retention": "mean", "Peak Enrolled": "max"
+    })
+
+
+# Share of every department in a term's enrollment, from the long department table
+def department_shares(data):
+    totals = melt_departments(data).groupby(["Term", "Department"], observed=True)["Enrolled"].sum().unstack("Department")
+    return totals.div(totals.sum(axis=1), axis=0)
+
+
+# Draws of everything in the funnel that does not depend on the admit rate, one row per term and one
+# column per scenario (so totals over terms add contiguous rows): next-year applications (from the forecast's predictive distribution), yield and retention rates
+# (Beta fitted to the yearly rates), and standard normal noise for the admit, enroll and retain steps.
+# They are drawn once per dataset version; simulate_funnel only transforms them.
+def draw_funnel_scenarios(data, n_scenarios=FUNNEL_SCENARIOS, seed=0):
+    rng = np.random.default_rng(seed)
+    history = funnel_history(data)
+    terms = history.index
+    shape = (len(terms), n_scenarios)
+
+    # Applications follow the forecast's predictive Student-t distribution (a point forecast when it has no spread)
+    forecast = forecast_next_terms(data, ["Applications"]).set_index("Term").loc[terms]
+    spread = np.nan_to_num(forecast["Std Error"].to_numpy())[:, None] * rng.standard_t(forecast["Degrees of Freedom"].fillna(1).to_numpy()[:, None], shape)
+    applications = np.maximum(forecast["Forecast"].to_numpy()[:, None] + spread, 0)
+
+    by_year = data.pivot_table(index="Year", columns="Term", aggfunc="mean", values=["Admitted", "Enrolled", "Retention Rate (%)"])
+    yield_alpha, yield_beta = _beta_parameters((by_year["Enrolled"] / by_year["Admitted"])[terms])
+    retention_alpha, retention_beta = _beta_parameters((by_year["Retention Rate (%)"] / 100)[terms])
+
+    return {
+        "terms": list(terms),
+        "history": history,
+        "department_shares": department_shares(data).loc[terms],
+        "applications": applications.astype(np.float32),
+        "yield": rng.beta(yield_alpha[:, None], yield_beta[:, None], shape).astype(np.float32),
+        "retention": rng.beta(retention_alpha[:, None], retention_beta[:, None], shape).astype(np.float32),
+        "noise": rng.standard_normal((3, *shape), dtype=np.float32)
+    }
+
+
+# Binomial(n, p) draws from standard normal noise; n is in the hundreds or thousands, where the normal
+# approximation is exact to within a student
+def _binomial(n, p, noise):
+    mean = n * p
+    draws = np.sqrt(mean * (1 - p))
+    draws *= noise
+    draws += mean
+    return np.maximum(draws, 0, out=draws)
+
+
+# Next-year funnel of every scenario at a target admit rate, with term capacity set to capacity_factor times
+# the historical peak enrollment of the term. Returns (terms x scenarios) arrays of enrolled and retained
+# students and of enrolled students above capacity. Only array arithmetic runs here, so moving a slider
+# re-simulates every scenario in tens of milliseconds.
+def simulate_funnel(scenarios, admit_rate, capacity_factor=1.0):
+    admit_noise, enroll_noise, retain_noise = scenarios["noise"]
+    admitted = _binomial(scenarios["applications"], np.float32(admit_rate), admit_noise)
+    enrolled = _binomial(admitted, scenarios["yield"], enroll_noise)
+    retained = _binomial(enrolled, scenarios["retention"], retain_noise)
+    capacity = (capacity_factor * scenarios["history"]["Peak Enrolled"].to_numpy()).astype(np.float32)
+    return {
+        "enrolled": enrolled,
+        "retained": retained,
+        "overflow": np.maximum(enrolled - capacity[:, None], 0),
+        "capacity": capacity
+    }
+
+
+# Percentiles along the last axis, as np.percentile with linear interpolation, from one np.partition
+# that places every needed order statistic instead of a pass per percentile
+def _percentiles(values, q):
+    n = values.shape[-1]
+    position = np.asarray(q, dtype=np.float64) / 100 * (n - 1)
+    lower = np.floor(position).astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    ordered = np.partition(values, np.union1d(lower, upper), axis=-1)
+    return ordered[..., lower] + (ordered[..., upper] - ordered[..., lower]) * (position - lower)
+
+
+# What the dashboard shows of one simulation: 5th, 50th and 95th percentiles of next-year enrollment, the chance
+# and expected size of an overflow, a histogram of the scenarios and the department outlook. It is a few
+# kilobytes, so it can be memoized per slider setting while the simulation arrays are dropped.
+def funnel_summary(scenarios, admit_rate, capacity_factor=1.0, bins=60):
+    simulation = simulate_funnel(scenarios, admit_rate, capacity_factor)
+    year_enrolled = simulation["enrolled"].sum(axis=0)
+    year_overflow = simulation["overflow"].sum(axis=0)
+    counts, edges = np.histogram(year_enrolled, bins=bins)
+    return {
+        "n_scenarios": len(year_enrolled),
+        "percentiles": _percentiles(year_enrolled, [5, 50, 95]),
+        "overflow_probability": float((year_overflow > 0).mean()),
+        "expected_overflow": float(year_overflow.mean()),
+        "capacity": float(simulation["capacity"].sum()),
+        "histogram": (counts, edges),
+        "department_outlook": department_outlook(scenarios, simulation)
+    }
+
+
+# Median next-year enrollment of every department per term, splitting simulated enrollment by the historical shares
+def department_outlook(scenarios, simulation):
+    median_enrolled = _percentiles(simulation["enrolled"], 50)
+    return scenarios["department_shares"].mul(median_enrolled, axis=0).T.round().astype(int)
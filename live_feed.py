@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# A feed with no reader for this long stops its ingestion thread; the next read starts it again
+LIVE_FEED_IDLE_SECONDS = 60
+
+
+# Departure counts over a sliding time window, kept per destination, airline and departure hour.
+# The window is a ring of one-second buckets plus a running total: adding a batch touches only its own
+# bucket, and a bucket that falls out of the window is subtracted once, so the cost of an update is
+# O(new events) and never depends on how much history has been ingested.
+class RollingCounts:
+    def __init__(self, n_destinations, n_airlines, window_seconds=60, bucket_seconds=1):
+        # Destinations, airlines and hours share one key space so a batch is counted with a single bincount
+        self.offsets = np.array([0, n_destinations, n_destinations + n_airlines])
+        self.width = n_destinations + n_airlines + 24
+        self.bucket_seconds = bucket_seconds
+        self.buckets = np.zeros((int(np.ceil(window_seconds / bucket_seconds)), self.width), dtype=np.int64)
+        self.bucket_ids = np.full(len(self.buckets), -1, dtype=np.int64)
+        self.totals = np.zeros(self.width, dtype=np.int64)
+        self.events = 0
+        self.lock = threading.Lock()
+
+    # Drop every bucket older than the window ending at bucket_id
+    def _expire(self, bucket_id):
+        stale = self.bucket_ids <= bucket_id - len(self.buckets)
+        if stale.any():
+            self.totals -= self.buckets[stale].sum(axis=0)
+            self.buckets[stale] = 0
+            self.bucket_ids[stale] = -1
+
+    # Count a batch of events that share one timestamp
+    def add(self, timestamp, dest_id, airline_code, hour):
+        bucket_id = int(timestamp // self.bucket_seconds)
+        keys = np.concatenate([dest_id + self.offsets[0], airline_code + self.offsets[1], hour + self.offsets[2]])
+        counts = np.bincount(keys, minlength=self.width)
+        with self.lock:
+            self._expire(bucket_id)
+            slot = bucket_id % len(self.buckets)
+            self.bucket_ids[slot] = bucket_id
+            self.buckets[slot] += counts
+            self.totals += counts
+            self.events += len(dest_id)
+
+    # Window totals as of now: (per destination, per airline, per hour), plus the events counted since the start
+    def snapshot(self, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            self._expire(int(now // self.bucket_seconds))
+            totals = self.totals.copy()
+            events = self.events
+        return np.split(totals, self.offsets[1:]), events
+
+
+# Local stand-in for a departure feed: replays the flight table in a shuffled loop, one batch per tick,
+# each event stamped with the time it is emitted
+async def replay_departures(flights, events_per_second, tick_seconds=0.1, seed=0):
+    rng = np.random.default_rng(seed)
+    dest_id = flights["dest_id"].to_numpy()
+    airline_code = flights["airline"].cat.codes.to_numpy()
+    hour = flights["flight_hour"].to_numpy()
+    order = rng.permutation(len(flights))
+    position = 0
+    while True:
+        batch_size = max(1, int(events_per_second * tick_seconds))
+        rows = order[np.arange(position, position + batch_size) % len(order)]
+        position = (position + batch_size) % len(order)
+        yield time.time(), dest_id[rows], airline_code[rows], hour[rows]
+        await asyncio.sleep(tick_seconds)
+
+
+# Rolling counts of one airport's departures fed by a background asyncio ingestion task.
+# The task runs in its own thread and event loop, stops after LIVE_FEED_IDLE_SECONDS without a reader,
+# and is restarted by the next call to ensure_running.
+class LiveFeed:
+    def __init__(self, destinations, flights, events_per_second, window_seconds=60):
+        self.destinations = destinations["destination_airport"].to_numpy()
+        self.airlines = list(flights["airline"].cat.categories)
+        self.flights = flights
+        self.events_per_second = events_per_second
+        self.counts = RollingCounts(len(self.destinations), len(self.airlines), window_seconds)
+        self.last_read = time.monotonic()
+        self.thread = None
+        self.thread_lock = threading.Lock()
+
+    async def _ingest(self):
+        async for batch in replay_departures(self.flights, self.events_per_second):
+            self.counts.add(*batch)
+            if time.monotonic() - self.last_read > LIVE_FEED_IDLE_SECONDS:
+                break
+
+    def ensure_running(self):
+        self.last_read = time.monotonic()
+        with self.thread_lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=asyncio.run, args=(self._ingest(),), name="live-feed", daemon=True)
+                self.thread.start()
+
+    # Rolling-window departures per destination, airline and hour as Series, busiest first
+    def snapshot(self):
+        self.ensure_running()
+        (by_destination, by_airline, by_hour), events = self.counts.snapshot()
+        return {
+            "destinations": pd.Series(by_destination, index=self.destinations).sort_values(ascending=False),
+            "airlines": pd.Series(by_airline, index=self.airlines).sort_values(ascending=False),
+            "hours": pd.Series(by_hour, index=range(24)),
+            "events": events
+        }
@@ -0,0 +1,174 @@
+import contextlib
+import glob
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+# Local BTS On-Time Performance files (CSV, or the zipped CSV TranStats downloads), one or more months each
+ONTIME_DIR = "ontime"
+ONTIME_PATTERNS = ("*.csv", "*.zip")
+
+# Columns the pipeline reads, with the field names used by the TranStats download and by the older pre-zipped files
+ONTIME_COLUMNS = {
+    "airline": ("OP_UNIQUE_CARRIER", "Reporting_Airline"),
+    "origin": ("ORIGIN", "Origin"),
+    "destination": ("DEST", "Dest"),
+    "scheduled_departure": ("CRS_DEP_TIME", "CRSDepTime"),
+    "arrival_delay": ("ARR_DELAY", "ArrDelay"),
+    "cancelled": ("CANCELLED", "Cancelled")
+}
+ONTIME_DTYPES = {
+    "airline": "category",
+    "origin": "category",
+    "destination": "category",
+    "scheduled_departure": np.float32,
+    "arrival_delay": np.float32,
+    "cancelled": np.float32
+}
+
+# Arrival delay histogram bins in minutes; a flight is on time when it arrives less than 15 minutes late
+DELAY_BIN_EDGES = [0, 15, 30, 60, 120, 180]
+DELAY_BIN_LABELS = ["Early", "0-14 min", "15-29 min", "30-59 min", "1-2 h", "2-3 h", "3 h+"]
+
+# Aggregate columns of every summary table; delay_sum and delay_count give the mean arrival delay
+SUMMARY_COLUMNS = ["flights", "cancelled", "delay_sum", "delay_count", *DELAY_BIN_LABELS]
+
+# Breakdowns kept per origin airport, one aggregate table each
+SUMMARY_TABLES = ("airline", "hour", "destination")
+
+
+# On-time files in the data directory, sorted by name
+def ontime_files(ontime_dir=ONTIME_DIR):
+    paths = [path for pattern in ONTIME_PATTERNS for path in glob.glob(os.path.join(ontime_dir, pattern))]
+    return sorted(paths)
+
+
+# Fingerprint (path, size and mtime) of every on-time file, or None when there are none
+def ontime_data_version(ontime_dir=ONTIME_DIR):
+    paths = ontime_files(ontime_dir)
+    if not paths:
+        return None
+    return tuple((path, f"{os.stat(path).st_size}:{os.stat(path).st_mtime_ns}") for path in paths)
+
+
+# Open an on-time file as a binary stream. TranStats zips hold one CSV next to other files (readme.html),
+# so the single .csv member is read rather than letting pandas reject a multi-file archive.
+@contextlib.contextmanager
+def _open_ontime_csv(path):
+    if not zipfile.is_zipfile(path):
+        with open(path, "rb") as csv_file:
+            yield csv_file
+        return
+    with zipfile.ZipFile(path) as archive:
+        members = [name for name in archive.namelist() if name.lower().endswith(".csv")]
+        if len(members) != 1:
+            raise ValueError(f"{path} should contain exactly one .csv file, found {len(members)}")
+        with archive.open(members[0]) as csv_file:
+            yield csv_file
+
+
+# Map the pipeline's column names to the ones used in this file's header
+def _source_columns(path):
+    with _open_ontime_csv(path) as csv_file:
+        header = pd.read_csv(csv_file, nrows=0).columns
+    columns = {}
+    for name, candidates in ONTIME_COLUMNS.items():
+        found = [candidate for candidate in candidates if candidate in header]
+        if not found:
+            raise ValueError(f"{path} has no {' or '.join(candidates)} column")
+        columns[found[0]] = name
+    return columns
+
+
+# Per-group aggregates of one chunk: flight and cancellation counts, delay sum/count and the delay histogram
+def _aggregate_chunk(chunk):
+    delay = chunk["arrival_delay"].to_numpy()
+    has_delay = ~np.isnan(delay)
+    delay_bin = np.digitize(np.nan_to_num(delay), DELAY_BIN_EDGES)
+
+    values = pd.DataFrame({
+        "flights": np.ones(len(chunk), dtype=np.int64),
+        "cancelled": (chunk["cancelled"].to_numpy() > 0).astype(np.int64),
+        "delay_sum": np.where(has_delay, delay, 0).astype(np.float64),
+        "delay_count": has_delay.astype(np.int64)
+    }, index=chunk.index)
+    for position, label in enumerate(DELAY_BIN_LABELS):
+        values[label] = (has_delay & (delay_bin == position)).astype(np.int64)
+
+    # Scheduled departure is hhmm local time; 2400 is midnight
+    keys = chunk[["origin", "airline", "destination"]].assign(
+        hour=(chunk["scheduled_departure"].to_numpy() // 100 % 24).astype(np.int8)
+    )
+    return {
+        table: values.groupby([keys["origin"], keys[table]], observed=True).sum()
+        for table in SUMMARY_TABLES
+    }
+
+
+# Stream one on-time file in chunks and fold every chunk into per-origin aggregate tables.
+# Only the needed columns are parsed, with compact dtypes, so peak memory depends on the chunk size and the
+# number of groups, never on the number of rows in the file.
+def summarize_ontime_file(path, chunksize=250_000):
+    columns = _source_columns(path)
+    dtypes = {source: ONTIME_DTYPES[name] for source, name in columns.items()}
+    summary = empty_ontime_summary()
+    with _open_ontime_csv(path) as csv_file:
+        for chunk in pd.read_csv(csv_file, usecols=list(columns), dtype=dtypes, chunksize=chunksize):
+            chunk = chunk.rename(columns=columns).dropna(subset=["origin", "destination", "scheduled_departure"])
+            summary = combine_ontime_summaries([summary, _aggregate_chunk(chunk)])
+    return summary
+
+
+# Summary with no flights, the starting point of an aggregation
+def empty_ontime_summary():
+    return {
+        table: pd.DataFrame(
+            columns=SUMMARY_COLUMNS,
+            index=pd.MultiIndex.from_arrays([[], []], names=["origin", table])
+        )
+        for table in SUMMARY_TABLES
+    }
+
+
+# Add up summaries of different chunks or files
+def combine_ontime_summaries(summaries):
+    combined = {}
+    for table in SUMMARY_TABLES:
+        parts = [summary[table] for summary in summaries if not summary[table].empty]
+        if not parts:
+            combined[table] = empty_ontime_summary()[table]
+            continue
+        combined[table] = pd.concat(parts).groupby(level=[0, 1], observed=True).sum()
+    return combined
+
+
+# Origin airports present in a summary
+def ontime_airports(summary):
+    return set(summary["airline"].index.get_level_values("origin"))
+
+
+# One origin airport's breakdown by airline, hour or destination: flights, cancellation and on-time rates,
+# mean arrival delay and the arrival delay histogram
+def ontime_breakdown(summary, airport_code, table):
+    aggregates = summary[table].xs(airport_code, level="origin")
+    arrived = aggregates["delay_count"].replace(0, np.nan)
+    return pd.DataFrame({
+        "Flights": aggregates["flights"].astype(int),
+        "Cancelled (%)": (100 * aggregates["cancelled"] / aggregates["flights"]).round(1),
+        "On Time (%)": (100 * aggregates[DELAY_BIN_LABELS[:2]].sum(axis=1) / arrived).round(1),
+        "Mean Arrival Delay (min)": (aggregates["delay_sum"] / arrived).round(1),
+        **{label: aggregates[label].astype(int) for label in DELAY_BIN_LABELS}
+    })
+
+
+# Headline figures of one origin airport across all airlines
+def ontime_totals(summary, airport_code):
+    totals = summary["airline"].xs(airport_code, level="origin").sum()
+    return {
+        "flights": int(totals["flights"]),
+        "cancelled_pct": 100 * totals["cancelled"] / totals["flights"],
+        "on_time_pct": 100 * totals[DELAY_BIN_LABELS[:2]].sum() / max(totals["delay_count"], 1),
+        "mean_delay": totals["delay_sum"] / max(totals["delay_count"], 1)
+    }
@@ -0,0 +1,44 @@
+import importlib
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Sidebar pages with the libraries each one imports and its cold-start import budget (seconds).
+# Keep "modules" in sync with the imports of the matching branch in app.py and the data module it loads,
+# including the default section. Libraries behind an opt-in control (Problem 1's pydeck renderer, the
+# sklearn airport index, the scipy route graph and the pyarrow route cache) load on demand and are not listed.
+PAGES = {
+    "Home": {
+        "modules": (),
+        "budget": 0.05,
+    },
+    "Problem 1: Airport Analysis": {
+        "modules": ("numpy", "pandas", "plotly.express", "plotly.graph_objects", "folium"),
+        "budget": 0.6,
+    },
+    "Problem 2: University Dashboard": {
+        "modules": ("numpy", "pandas", "plotly.express", "plotly.graph_objects", "scipy.special"),
+        "budget": 0.6,
+    },
+    "Problem 3: Data Visualization Comparison": {
+        "modules": ("numpy", "pandas", "matplotlib.pyplot", "seaborn", "sklearn.linear_model"),
+        "budget": 1.5,
+    },
+}
+
+
+# Import the libraries registered for a page and return how long it took.
+# The first call in a process pays the cold-start cost; later calls only hit sys.modules.
+def load_page_modules(page):
+    start = time.perf_counter()
+    for module_name in PAGES[page]["modules"]:
+        importlib.import_module(module_name)
+    elapsed = time.perf_counter() - start
+
+    if elapsed > PAGES[page]["budget"]:
+        logger.warning(
+            "Importing libraries for %r took %.2fs (budget %.2fs)",
+            page, elapsed, PAGES[page]["budget"]
+        )
+    return elapsed
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+# Route graph over every airport in the network. The adjacency is a boolean CSR matrix
+# (row = origin, column = destination); its transpose is kept in CSR form as well so that
+# one BFS step is a single sparse matrix-vector product.
+# With symmetric=True every route is also added in the return direction.
+def build_route_graph(sources, destinations, symmetric=False):
+    sources = np.asarray(sources, dtype=object)
+    destinations = np.asarray(destinations, dtype=object)
+    codes = pd.Index(np.unique(np.concatenate([sources, destinations])))
+    rows = codes.get_indexer(sources)
+    cols = codes.get_indexer(destinations)
+    if symmetric:
+        rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+
+    # Parallel routes (one per airline) collapse into one edge; self-loops are dropped
+    keep = rows != cols
+    adjacency = sparse.csr_matrix(
+        (np.ones(keep.sum(), dtype=bool), (rows[keep], cols[keep])),
+        shape=(len(codes), len(codes))
+    )
+    adjacency.sum_duplicates()
+    return {"codes": codes, "adjacency": adjacency, "incoming": adjacency.T.tocsr()}
+
+
+# BFS from one airport: 0 for the airport itself, k for airports first reached after k flights
+# (1 = direct, 2 = one stop, 3 = two stops) and -1 for airports not reachable within max_flights.
+# Each level expands the whole frontier at once with one sparse product.
+def reachability_levels(graph, airport_code, max_flights=3):
+    levels = np.full(len(graph["codes"]), -1, dtype=np.int8)
+    frontier = np.zeros(len(graph["codes"]), dtype=np.int32)
+    start = graph["codes"].get_loc(airport_code)
+    levels[start] = 0
+    frontier[start] = 1
+
+    for level in range(1, max_flights + 1):
+        reached = (graph["incoming"] @ frontier) > 0
+        new = reached & (levels < 0)
+        if not new.any():
+            break
+        levels[new] = level
+        frontier = new.astype(np.int32)
+    return levels
+
+
+# Direct destinations of an airport ranked by how many of its one-stop destinations they connect to
+def connecting_hubs(graph, levels):
+    direct = np.flatnonzero(levels == 1)
+    one_stop = levels == 2
+    connections = np.asarray(graph["adjacency"][direct][:, one_stop].sum(axis=1)).ravel()
+    hubs = pd.DataFrame({
+        "Hub": graph["codes"][direct],
+        "One-stop Destinations": connections,
+        "Hub Routes": np.diff(graph["adjacency"].indptr)[direct]
+    })
+    return hubs.sort_values(["One-stop Destinations", "Hub Routes"], ascending=False, ignore_index=True)
+
+
+# Network-wide hub ranking. The transfer score counts the two-flight itineraries that pass through an
+# airport (incoming x outgoing routes), a cheap stand-in for betweenness on a route network.
+def hub_ranking(graph):
+    outgoing = np.diff(graph["adjacency"].indptr)
+    incoming = np.diff(graph["incoming"].indptr)
+    ranking = pd.DataFrame({
+        "Airport": graph["codes"],
+        "Outgoing Routes": outgoing,
+        "Incoming Routes": incoming,
+        "Transfer Score": outgoing.astype(np.int64) * incoming
+    })
+    return ranking.sort_values("Transfer Score", ascending=False, ignore_index=True)
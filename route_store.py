@@ -0,0 +1,204 @@
+import functools
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from airport_data import airport_rng
+from airport_geo import distance_matrix
+
+# Local OpenFlights-style route files and the columnar cache built from them
+ROUTES_PATH = "routes.dat"
+AIRPORTS_PATH = "airports.dat"
+ROUTE_CACHE_DIR = ".route_cache"
+
+# OpenFlights column layouts; the files have no header row and write missing values as \N
+ROUTE_COLUMNS = [
+    "airline", "airline_id", "source", "source_id", "destination", "destination_id",
+    "codeshare", "stops", "equipment"
+]
+AIRPORT_COLUMNS = [
+    "airport_id", "name", "city", "country", "iata", "icao", "lat", "lon",
+    "altitude", "timezone", "dst", "tz", "type", "data_source"
+]
+
+
+# Version of the local route files (size and mtime), or None when they are not available
+def route_data_version(routes_path=ROUTES_PATH, airports_path=AIRPORTS_PATH):
+    try:
+        stats = [os.stat(routes_path), os.stat(airports_path)]
+    except FileNotFoundError:
+        return None
+    return "-".join(f"{stat.st_size}:{stat.st_mtime_ns}" for stat in stats)
+
+
+# Serializes cache rebuilds within the process; every loader and the prewarm thread may start one
+_build_lock = threading.Lock()
+
+
+# Version of the route files the cache in cache_dir was built from, or None when there is no cache
+def _built_version(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "VERSION")) as version_file:
+            return version_file.read()
+    except FileNotFoundError:
+        return None
+
+
+def _cache_path(cache_dir, name):
+    return os.path.join(cache_dir, f"{name}.feather")
+
+
+# Convert the route files to the on-disk cache, unless the cache already matches their version.
+# The route file is streamed in chunks and only direct routes between known airports are kept.
+# Routes are stored sorted by source airport, with an index of each source's row range.
+# A rebuild runs under a lock and writes a new directory next to the cache, which is then swapped in,
+# so readers never see a mix of old and half-written files.
+def build_route_cache(routes_path=ROUTES_PATH, airports_path=AIRPORTS_PATH,
+                      cache_dir=ROUTE_CACHE_DIR, chunksize=50_000):
+    version = route_data_version(routes_path, airports_path)
+    if _built_version(cache_dir) == version:
+        return
+    with _build_lock:
+        if _built_version(cache_dir) == version:
+            return
+        parent = os.path.dirname(os.path.abspath(cache_dir))
+        build_dir = tempfile.mkdtemp(prefix=".route_cache_build_", dir=parent)
+        try:
+            _write_route_cache(routes_path, airports_path, build_dir, version, chunksize)
+            if os.path.exists(cache_dir):
+                old_dir = tempfile.mkdtemp(prefix=".route_cache_old_", dir=parent)
+                os.replace(cache_dir, os.path.join(old_dir, "cache"))
+                os.replace(build_dir, cache_dir)
+                shutil.rmtree(old_dir, ignore_errors=True)
+            else:
+                os.replace(build_dir, cache_dir)
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+
+def _write_route_cache(routes_path, airports_path, cache_dir, version, chunksize):
+    import pyarrow.feather as feather
+
+    airports = pd.read_csv(
+        airports_path, header=None, names=AIRPORT_COLUMNS,
+        usecols=["name", "city", "country", "iata", "lat", "lon"],
+        na_values=["\\N"], keep_default_na=False
+    )
+    airports = airports.dropna(subset=["iata", "lat", "lon"]).drop_duplicates("iata").reset_index(drop=True)
+    known_airports = pd.Index(airports["iata"])
+
+    chunks = []
+    for chunk in pd.read_csv(
+        routes_path, header=None, names=ROUTE_COLUMNS,
+        usecols=["airline", "source", "destination", "stops"],
+        na_values=["\\N"], keep_default_na=False, dtype=str, chunksize=chunksize
+    ):
+        direct = (
+            (chunk["stops"] == "0")
+            & (known_airports.get_indexer(chunk["source"]) >= 0)
+            & (known_airports.get_indexer(chunk["destination"]) >= 0)
+        )
+        chunks.append(chunk.loc[direct, ["source", "destination", "airline"]])
+
+    routes = pd.concat(chunks, ignore_index=True)
+    routes = routes.sort_values("source", kind="stable", ignore_index=True).astype("category")
+
+    # Contiguous row range of every source airport in the sorted route table
+    sources, starts, counts = np.unique(routes["source"].astype(str).to_numpy(), return_index=True, return_counts=True)
+    index = pd.DataFrame({"source": sources, "start": starts, "stop": starts + counts})
+
+    # Uncompressed Feather so slices can be read through a memory map without decoding the whole file
+    feather.write_feather(routes, _cache_path(cache_dir, "routes"), compression="uncompressed")
+    feather.write_feather(index, _cache_path(cache_dir, "index"), compression="uncompressed")
+    feather.write_feather(airports, _cache_path(cache_dir, "airports"), compression="uncompressed")
+    with open(os.path.join(cache_dir, "VERSION"), "w") as version_file:
+        version_file.write(version)
+
+
+# Version of the route files the cache was built from
+def route_cache_version(cache_dir=ROUTE_CACHE_DIR):
+    with open(os.path.join(cache_dir, "VERSION")) as version_file:
+        return version_file.read()
+
+
+# Great-circle distances (nautical miles) from every source airport to every destination airport in
+# the cache, computed in one pass and kept for the process. Returns the row index, column index and matrix.
+@functools.lru_cache(maxsize=1)
+def route_distance_matrix(cache_dir, version):
+    airports = pd.read_feather(_cache_path(cache_dir, "airports")).set_index("iata")
+    source_index = pd.Index(pd.read_feather(_cache_path(cache_dir, "index"))["source"])
+    dest_index = pd.Index(pd.read_feather(_cache_path(cache_dir, "routes"), columns=["destination"])
+                          ["destination"].cat.categories)
+    matrix = distance_matrix(
+        airports.loc[source_index, "lat"], airports.loc[source_index, "lon"],
+        airports.loc[dest_index, "lat"], airports.loc[dest_index, "lon"]
+    )
+    matrix.flags.writeable = False
+    return source_index, dest_index, matrix
+
+
+# Source airports in the cache with a selectbox label, busiest first
+def route_airport_options(cache_dir=ROUTE_CACHE_DIR):
+    index = pd.read_feather(_cache_path(cache_dir, "index"))
+    airports = pd.read_feather(_cache_path(cache_dir, "airports")).set_index("iata")
+    index = index.assign(routes=index["stop"] - index["start"]).sort_values("routes", ascending=False)
+    names = airports.loc[index["source"], "name"].to_numpy()
+    cities = airports.loc[index["source"], "city"].to_numpy()
+    return [f"{code} - {name} ({city})" for code, name, city in zip(index["source"], names, cities)]
+
+
+# Read only the routes of one source airport from the memory-mapped cache
+def read_source_routes(airport_code, cache_dir=ROUTE_CACHE_DIR):
+    import pyarrow.feather as feather
+
+    index = pd.read_feather(_cache_path(cache_dir, "index")).set_index("source")
+    start, stop = index.loc[airport_code, ["start", "stop"]]
+    table = feather.read_table(_cache_path(cache_dir, "routes"), memory_map=True)
+    return table.slice(start, stop - start).to_pandas()
+
+
+# Origin and destination of every direct route in the cache, for the network-wide route graph
+def read_route_edges(cache_dir=ROUTE_CACHE_DIR):
+    routes = pd.read_feather(_cache_path(cache_dir, "routes"), columns=["source", "destination"])
+    return routes["source"].astype(str).to_numpy(), routes["destination"].astype(str).to_numpy()
+
+
+# Codes and coordinates of every airport in the cache, served or not, for the airport spatial index
+def read_airport_locations(cache_dir=ROUTE_CACHE_DIR):
+    airports = pd.read_feather(_cache_path(cache_dir, "airports"), columns=["iata", "lat", "lon"])
+    return airports["iata"].to_numpy(), airports["lat"].to_numpy(), airports["lon"].to_numpy()
+
+
+# Star-schema tables for one source airport from the route cache, matching generate_airport_data.
+# The route files carry no schedules, so each route gets a simulated departure hour. Routes without an
+# airline code are kept under an explicit "Unknown" carrier.
+def load_route_airport_data(airport_code, cache_dir=ROUTE_CACHE_DIR):
+    routes = read_source_routes(airport_code, cache_dir)
+    airports = pd.read_feather(_cache_path(cache_dir, "airports")).set_index("iata")
+    source_airport = airports.loc[airport_code]
+    source = {"code": airport_code, "lat": source_airport["lat"], "lon": source_airport["lon"]}
+
+    dest_codes, dest_id = np.unique(routes["destination"].astype(str).to_numpy(), return_inverse=True)
+    dest_airports = airports.loc[dest_codes]
+    source_index, dest_index, distances = route_distance_matrix(cache_dir, route_cache_version(cache_dir))
+    destinations = pd.DataFrame({
+        "destination_airport": dest_codes,
+        "destination_name": dest_airports["name"].to_numpy(),
+        "destination_lat": dest_airports["lat"].to_numpy(),
+        "destination_lon": dest_airports["lon"].to_numpy(),
+        "domestic": (dest_airports["country"] == source_airport["country"]).to_numpy(),
+        "region": dest_airports["country"].to_numpy(),
+        "distance": distances[source_index.get_loc(airport_code), dest_index.get_indexer(dest_codes)]
+    })
+    destinations.index.name = "dest_id"
+
+    flights = pd.DataFrame({
+        "dest_id": dest_id.astype(np.int16),
+        "airline": routes["airline"].astype(object).fillna("Unknown").astype("category"),
+        "flight_hour": airport_rng(airport_code).integers(0, 24, size=len(routes), dtype=np.uint8)
+    })
+    return source, destinations, flights
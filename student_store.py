@@ -0,0 +1,243 @@
+import importlib.util
+import os
+
+import numpy as np
+import pandas as pd
+
+# Optional student-level records, one row per applicant. When present they replace the per-term table
+# of Problem 2, which is then aggregated from them by a query backend.
+STUDENT_RECORDS_PATH = "university_student_records.parquet"
+STUDENT_COLUMNS = ["Year", "Term", "Department", "Admitted", "Enrolled", "Retained", "Satisfaction"]
+
+# Optional enrollment records, one row per student and enrolled term, used for the cohort retention matrix
+ENROLLMENT_RECORDS_PATH = "university_enrollment_records.parquet"
+ENROLLMENT_COLUMNS = ["StudentID", "Year", "Term"]
+
+# Order of terms within an academic year; other term names follow these alphabetically
+TERM_ORDER = ("Spring", "Summer", "Fall")
+
+# Departments of the synthetic records, with the share of applicants in each. Real records may have any
+# departments; the backends take them from the data.
+DEPARTMENTS = {"Engineering": 0.33, "Business": 0.25, "Arts": 0.22, "Science": 0.20}
+
+# Leading columns of the per-term table the backends produce, as in university_student_dashboard_data.csv.
+# One "<Department> Enrolled" column per department in the records follows them.
+TERM_TABLE_COLUMNS = [
+    "Year", "Term", "Applications", "Admitted", "Enrolled", "Retention Rate (%)", "Student Satisfaction (%)"
+]
+
+
+def student_records_available(path=STUDENT_RECORDS_PATH):
+    return os.path.exists(path)
+
+
+# Synthetic applicant records with the same trends as the per-term sample data, drawn in batched NumPy calls
+def generate_student_records(n_rows, years=range(2015, 2025), terms=("Spring", "Fall"), seed=42):
+    rng = np.random.default_rng(seed)
+    years = np.asarray(years, dtype=np.int16)
+    year = years[rng.integers(0, len(years), n_rows)]
+    trend = (year - years.min()).astype(np.float32)
+
+    admitted = rng.random(n_rows) < 0.6
+    enrolled = admitted & (rng.random(n_rows) < 0.42)
+    retained = enrolled & (rng.random(n_rows) < (85 + np.minimum(trend, 5)) / 100)
+    satisfaction = np.where(
+        enrolled,
+        np.clip(rng.normal(78 + np.minimum(trend, 10), 8), 0, 100),
+        np.nan
+    ).astype(np.float32)
+    return pd.DataFrame({
+        "Year": year,
+        "Term": pd.Categorical.from_codes(rng.integers(0, len(terms), n_rows), categories=list(terms)),
+        "Department": pd.Categorical.from_codes(
+            rng.choice(len(DEPARTMENTS), n_rows, p=list(DEPARTMENTS.values())), categories=list(DEPARTMENTS)
+        ),
+        "Admitted": admitted,
+        "Enrolled": enrolled,
+        "Retained": retained,
+        "Satisfaction": satisfaction
+    })
+
+
+# Write records as Parquet; Term and Department are dictionary-encoded
+def write_student_records(records, path=STUDENT_RECORDS_PATH):
+    records[STUDENT_COLUMNS].to_parquet(path, index=False)
+
+
+# Shared finishing step of every backend: column order, sort order and dtypes of the per-term table.
+# Department columns are every "<Department> Enrolled" column, in alphabetical order; terms without
+# enrolled students in a department count zero.
+def _term_table(summary):
+    department_columns = sorted(column for column in summary.columns if column.endswith(" Enrolled"))
+    summary = summary[TERM_TABLE_COLUMNS + department_columns].astype({"Term": str})
+    summary = summary.sort_values(["Year", "Term"], ignore_index=True)
+    summary[department_columns] = summary[department_columns].fillna(0)
+    for column in ["Year", "Applications", "Admitted", "Enrolled", *department_columns]:
+        summary[column] = summary[column].astype(np.int64)
+    for column in ["Retention Rate (%)", "Student Satisfaction (%)"]:
+        summary[column] = summary[column].astype(np.float64).round(1)
+    return summary
+
+
+# pandas backend: loads the record columns and aggregates them with a groupby; department counts are a
+# second groupby over the enrolled rows, pivoted to one column per department
+def pandas_term_summary(path=STUDENT_RECORDS_PATH):
+    records = pd.read_parquet(path, columns=STUDENT_COLUMNS)
+    enrolled = records["Enrolled"]
+    values = pd.DataFrame({
+        "Year": records["Year"],
+        "Term": records["Term"],
+        "Applications": 1,
+        "Admitted": records["Admitted"],
+        "Enrolled": enrolled,
+        "Retained": records["Retained"] & enrolled,
+        "Satisfaction": records["Satisfaction"].where(enrolled)
+    })
+    grouped = values.groupby(["Year", "Term"], observed=True)
+    summary = grouped.sum(numeric_only=True).drop(columns="Satisfaction")
+    summary["Retention Rate (%)"] = 100 * summary.pop("Retained") / summary["Enrolled"]
+    summary["Student Satisfaction (%)"] = grouped["Satisfaction"].mean()
+
+    departments = records["Department"].astype(str)
+    by_department = (
+        records[enrolled].groupby(["Year", "Term", departments[enrolled]], observed=True).size()
+        .unstack()
+        .reindex(columns=departments.unique())
+    )
+    by_department.columns = [f"{department} Enrolled" for department in by_department.columns]
+    return _term_table(summary.join(by_department).reset_index())
+
+
+# DuckDB backend: the aggregation runs as SQL over the Parquet file, which is never loaded into pandas.
+# The departments are read with a SELECT DISTINCT first and become one FILTER column each.
+def duckdb_term_summary(path=STUDENT_RECORDS_PATH):
+    import duckdb
+
+    with duckdb.connect() as connection:
+        departments = [row[0] for row in connection.execute(
+            "SELECT DISTINCT CAST(Department AS VARCHAR) FROM read_parquet($path)", {"path": path}
+        ).fetchall()]
+        parameters = {"path": path, **{f"department_{i}": department for i, department in enumerate(departments)}}
+        department_columns = "".join(
+            f",\n            count(*) FILTER (WHERE Enrolled AND Department = $department_{i}) AS "
+            + '"' + f"{department} Enrolled".replace('"', '""') + '"'
+            for i, department in enumerate(departments)
+        )
+        query = f"""
+            SELECT
+                Year,
+                Term,
+                count(*) AS Applications,
+                count(*) FILTER (WHERE Admitted) AS Admitted,
+                count(*) FILTER (WHERE Enrolled) AS Enrolled,
+                100.0 * count(*) FILTER (WHERE Enrolled AND Retained)
+                    / count(*) FILTER (WHERE Enrolled) AS "Retention Rate (%)",
+                avg(Satisfaction) FILTER (WHERE Enrolled) AS "Student Satisfaction (%)"{department_columns}
+            FROM read_parquet($path)
+            GROUP BY Year, Term
+        """
+        return _term_table(connection.execute(query, parameters).df())
+
+
+# Polars backend: lazy scans of the Parquet file, so only the aggregated results are materialized.
+# Department counts are grouped per (Year, Term, Department) and pivoted to one column per department.
+def polars_term_summary(path=STUDENT_RECORDS_PATH):
+    import polars as pl
+
+    enrolled = pl.col("Enrolled")
+    records = pl.scan_parquet(path).with_columns(pl.col("Term", "Department").cast(pl.Utf8))
+    summary = records.group_by(["Year", "Term"]).agg([
+        pl.len().alias("Applications"),
+        pl.col("Admitted").sum(),
+        enrolled.sum(),
+        (100 * (pl.col("Retained") & enrolled).sum() / enrolled.sum()).alias("Retention Rate (%)"),
+        pl.col("Satisfaction").filter(enrolled).mean().alias("Student Satisfaction (%)")
+    ]).collect()
+    departments = records.select(pl.col("Department").unique()).collect()["Department"].to_list()
+    by_department = (
+        records.filter(enrolled).group_by(["Year", "Term", "Department"]).agg(pl.len()).collect()
+        .pivot(on="Department", index=["Year", "Term"], values="len")
+    )
+    by_department = by_department.rename({department: f"{department} Enrolled" for department in by_department.columns
+                                          if department in departments})
+    summary = summary.join(by_department, on=["Year", "Term"], how="left").to_pandas()
+    for department in departments:
+        if f"{department} Enrolled" not in summary:
+            summary[f"{department} Enrolled"] = 0
+    return _term_table(summary)
+
+
+# Query backends by name; pandas is the default and always installed, the others are optional
+BACKENDS = {
+    "pandas": pandas_term_summary,
+    "duckdb": duckdb_term_summary,
+    "polars": polars_term_summary
+}
+
+
+def available_backends():
+    return [name for name in BACKENDS if importlib.util.find_spec(name) is not None]
+
+
+# Synthetic enrollment records: every student enters in a random term and stays enrolled each following term
+# with retention_rate probability, for at most max_terms terms and never past the last term of the range
+def generate_enrollment_records(n_students, years=range(2015, 2025), terms=("Spring", "Fall"), retention_rate=0.9,
+                                max_terms=8, seed=42):
+    rng = np.random.default_rng(seed)
+    years = np.asarray(years)
+    n_periods = len(years) * len(terms)
+    entry = rng.integers(0, n_periods, n_students)
+    terms_enrolled = np.minimum(rng.geometric(1 - retention_rate, n_students), np.minimum(max_terms, n_periods - entry))
+
+    # Period of every (student, term) row: the entry period plus the row's position within its student
+    student = np.repeat(np.arange(n_students), terms_enrolled)
+    first_row = np.cumsum(terms_enrolled) - terms_enrolled
+    period = entry[student] + np.arange(len(student)) - first_row[student]
+    return pd.DataFrame({
+        "StudentID": student,
+        "Year": years[period // len(terms)],
+        "Term": pd.Categorical.from_codes(period % len(terms), categories=list(terms))
+    })
+
+
+def write_enrollment_records(records, path=ENROLLMENT_RECORDS_PATH):
+    records[ENROLLMENT_COLUMNS].to_parquet(path, index=False)
+
+
+# Chronological position of every term name
+def _term_positions(terms):
+    known = [term for term in TERM_ORDER if term in terms]
+    return {term: position for position, term in enumerate(known + sorted(set(terms) - set(known)))}
+
+
+# Entry-term x terms-since-entry retention triangle: the share (%) of each entry cohort still enrolled n terms
+# after entering. Students and terms are integer-coded, each student's entry term is a np.minimum.at
+# reduction and the cohort cells are counted with one np.bincount, so there is no groupby per cohort.
+# Cells past the last observed term are NaN.
+def cohort_retention(records):
+    student, _ = pd.factorize(records["StudentID"])
+    term_names = pd.unique(records["Term"].astype(str))
+    positions = _term_positions(term_names)
+    term_codes = records["Term"].astype(str).map(positions).to_numpy()
+    first_year = records["Year"].min()
+    period = (records["Year"].to_numpy() - first_year) * len(positions) + term_codes
+    n_periods = period.max() + 1
+
+    # Count each student once per term
+    enrolled = np.unique(student.astype(np.int64) * n_periods + period)
+    student, period = enrolled // n_periods, enrolled % n_periods
+
+    entry = np.full(student.max() + 1, n_periods, dtype=np.int64)
+    np.minimum.at(entry, student, period)
+    cohort = entry[student]
+    counts = np.bincount(cohort * n_periods + (period - cohort), minlength=n_periods * n_periods).reshape(n_periods, n_periods)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        retention = 100 * counts / counts[:, :1]
+    retention[np.arange(n_periods)[:, None] + np.arange(n_periods) >= n_periods] = np.nan
+
+    term_labels = sorted(positions, key=positions.get)
+    labels = [f"{first_year + p // len(positions)}-{term_labels[p % len(positions)]}" for p in range(n_periods)]
+    matrix = pd.DataFrame(retention, index=pd.Index(labels, name="Entry Term"),
+                          columns=pd.RangeIndex(n_periods, name="Terms Since Entry"))
+    return matrix.assign(Students=counts[:, 0]).loc[counts[:, 0] > 0]
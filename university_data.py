@@ -0,0 +1,154 @@
+import functools
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+UNIVERSITY_DATA_PATH = "university_student_dashboard_data.csv"
+
+
+# Read the university dashboard data, falling back to sample data when the file is unavailable
+def read_university_data(path=UNIVERSITY_DATA_PATH):
+    try:
+        data = pd.read_csv(path)
+        return data
+    except Exception as e:
+        return sample_university_data()
+
+
+# Sample per-term data, used when the university data file cannot be read
+def sample_university_data():
+    # Create sample data
+    np.random.seed(42)  # For reproducibility
+    years = range(2015, 2025)
+    terms = ["Spring", "Fall"]
+    data = []
+    for year in years:
+        for term in terms:
+            base_apps = 2500 + (year - 2015) * 100
+            base_retention = 85 + min((year - 2015), 5)
+            base_satisfaction = 78 + min((year - 2015), 10)
+
+            row = {
+                "Year": year,
+                "Term": term,
+                "Applications": base_apps + np.random.randint(-50, 50),
+                "Admitted": int(base_apps * 0.6) + np.random.randint(-30, 30),
+                "Enrolled": int(base_apps * 0.25) + np.random.randint(-15, 15),
+                "Retention Rate (%)": base_retention + np.random.randint(-2, 2),
+                "Student Satisfaction (%)": base_satisfaction + np.random.randint(-2, 2),
+                "Engineering Enrolled": int(base_apps * 0.25 * 0.33) + np.random.randint(-5, 5),
+                "Business Enrolled": int(base_apps * 0.25 * 0.25) + np.random.randint(-5, 5),
+                "Arts Enrolled": int(base_apps * 0.25 * 0.22) + np.random.randint(-5, 5),
+                "Science Enrolled": int(base_apps * 0.25 * 0.20) + np.random.randint(-5, 5)
+            }
+            data.append(row)
+    return pd.DataFrame(data)
+
+
+# Content hash of a file, recomputed only when its size or mtime changes
+@functools.lru_cache(maxsize=16)
+def _file_sha256(path, size, mtime_ns):
+    digest = hashlib.sha256()
+    with open(path, "rb") as data_file:
+        for block in iter(lambda: data_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Fingerprint (size, mtime and SHA-256) of the university data file, or None when it is unavailable
+def university_data_fingerprint(path=UNIVERSITY_DATA_PATH):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, _file_sha256(path, stat.st_size, stat.st_mtime_ns)
+
+
+# Bring a previous read of the file up to date. previous is None or the dict this function returned last time
+# (size, SHA-256 of the bytes read and the parsed data). When the file only gained rows at the end, just the
+# new bytes are parsed and appended; any other change falls back to a full read. Pass the file's current
+# fingerprint to reuse its hash instead of hashing the whole file again.
+def update_university_data(previous, path=UNIVERSITY_DATA_PATH, fingerprint=None):
+    with open(path, "rb") as data_file:
+        content = data_file.read()
+    if fingerprint is not None and fingerprint[0] == len(content):
+        sha256 = fingerprint[2]
+    else:
+        sha256 = hashlib.sha256(content).hexdigest()
+
+    if previous is not None and len(content) > previous["size"] and content[previous["size"] - 1:previous["size"]] == b"\n":
+        prefix = content[:previous["size"]]
+        if hashlib.sha256(prefix).hexdigest() == previous["sha256"]:
+            appended = pd.read_csv(io.BytesIO(content[previous["size"]:]), header=None, names=previous["data"].columns)
+            data = pd.concat([previous["data"], appended], ignore_index=True)
+            return {"size": len(content), "sha256": sha256, "data": data}
+
+    data = pd.read_csv(io.BytesIO(content))
+    return {"size": len(content), "sha256": sha256, "data": data}
+
+
+# Per-department enrollment columns of the per-term table, named "<Department> Enrolled"
+def department_columns(data):
+    return [column for column in data.columns if column.endswith(" Enrolled")]
+
+
+# Department enrollment in long format: one row per (data row, department) with a categorical Department.
+# Rows follow the data row by row, so data row i owns long rows i * n_departments up to (i + 1) * n_departments.
+def melt_departments(data):
+    columns = department_columns(data)
+    n_rows, n_departments = len(data), len(columns)
+    return pd.DataFrame({
+        "Year": np.repeat(data["Year"].to_numpy(), n_departments),
+        "Term": np.repeat(data["Term"].to_numpy(), n_departments),
+        "Department": pd.Categorical.from_codes(
+            np.tile(np.arange(n_departments), n_rows), categories=[column.removesuffix(" Enrolled") for column in columns]
+        ),
+        "Enrolled": data[columns].to_numpy().ravel()
+    })
+
+
+# Sort the data by (Year, Term) and index the row range of every (Year, Term) block, so filters resolve
+# to slices of the sorted table instead of masks over all of it. The long department table is built here too.
+def index_university_data(data):
+    data = data.sort_values(["Year", "Term"], kind="stable", ignore_index=True)
+    years = data["Year"].to_numpy()
+    terms = data["Term"].to_numpy()
+    boundaries = np.flatnonzero((years[1:] != years[:-1]) | (terms[1:] != terms[:-1])) + 1
+    starts = np.concatenate([[0], boundaries])
+    stops = np.concatenate([boundaries, [len(data)]])
+    blocks = pd.DataFrame({"Year": years[starts], "Term": terms[starts], "start": starts, "stop": stops})
+    return {"data": data, "departments": melt_departments(data), "years": years, "blocks": blocks}
+
+
+# Row positions of a year range (inclusive) and a set of terms: a slice when the whole range is selected,
+# otherwise the positions of the selected (Year, Term) blocks
+def _filter_rows(index, year_range, terms):
+    start, stop = np.searchsorted(index["years"], year_range[0], side="left"), np.searchsorted(index["years"], year_range[1], side="right")
+    block_years = index["blocks"]["Year"].to_numpy()
+    blocks = index["blocks"].iloc[
+        np.searchsorted(block_years, year_range[0], side="left"):np.searchsorted(block_years, year_range[1], side="right")
+    ]
+    selected = blocks["Term"].isin(terms).to_numpy()
+    if selected.all():
+        return slice(start, stop)
+    positions = [np.arange(block_start, block_stop) for block_start, block_stop
+                 in zip(blocks["start"].to_numpy()[selected], blocks["stop"].to_numpy()[selected])]
+    return np.concatenate(positions) if positions else np.array([], dtype=np.intp)
+
+
+# Rows of a year range (inclusive) and a set of terms. The year range is one contiguous slice found with
+# searchsorted and returned as a view; with only some terms selected, just their (Year, Term) blocks are taken.
+def filter_university_data(index, year_range, terms):
+    return index["data"].iloc[_filter_rows(index, year_range, terms)]
+
+
+# Long department rows of the same filter, mapped from the data rows
+def filter_department_data(index, year_range, terms):
+    rows = _filter_rows(index, year_range, terms)
+    n_departments = index["departments"]["Department"].cat.categories.size
+    if isinstance(rows, slice):
+        return index["departments"].iloc[rows.start * n_departments:rows.stop * n_departments]
+    return index["departments"].iloc[(rows[:, None] * n_departments + np.arange(n_departments)).ravel()]